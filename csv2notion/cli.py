@@ -1,14 +1,23 @@
 import logging
+import multiprocessing
 import os
 import signal
 import sys
+from argparse import Namespace
 from pathlib import Path
 from typing import Any, Optional
 
 from csv2notion.cli_args import parse_args
-from csv2notion.cli_steps import convert_csv_to_notion_rows, new_database, upload_rows
+from csv2notion.cli_steps import (
+    convert_csv_to_notion_rows,
+    convert_deferred_rows,
+    get_row_converter,
+    new_database,
+    upload_rows,
+)
 from csv2notion.csv_data import CSVData
 from csv2notion.notion_db import get_collection_id, get_notion_client
+from csv2notion.notion_db_cache import RowCache
 from csv2notion.utils_exceptions import CriticalError, NotionError
 
 logger = logging.getLogger(__name__)
@@ -28,9 +37,22 @@ def cli(*argv: str) -> None:
     if not csv_data:
         raise CriticalError("CSV file is empty")
 
+    row_cache = RowCache(args.rows_cache) if args.rows_cache else None
+
+    try:
+        import_csv(args, csv_data, row_cache)
+    finally:
+        if row_cache:
+            row_cache.close()
+
+
+def import_csv(
+    args: Namespace, csv_data: CSVData, row_cache: Optional[RowCache]
+) -> None:
     client = get_notion_client(
         args.token,
         is_randomize_select_colors=args.randomize_select_colors,
+        row_cache=row_cache,
     )
 
     if args.url:
@@ -38,18 +60,33 @@ def cli(*argv: str) -> None:
     else:
         collection_id = new_database(args, client, csv_data)
 
-    notion_rows = convert_csv_to_notion_rows(csv_data, client, collection_id, args)
+    converter = get_row_converter(csv_data, client, collection_id, args)
+
+    notion_rows = convert_csv_to_notion_rows(csv_data, converter, args)
 
     logger.info("Uploading {0}...".format(args.csv_file.name))
 
     upload_rows(
         notion_rows,
-        client=client,
-        collection_id=collection_id,
-        is_merge=args.merge,
+        total=converter.count_notion_rows(csv_data),
+        db=converter.db,
         max_threads=args.max_threads,
     )
 
+    if converter.has_deferred_rows:
+        logger.info("Updating rows within {0}...".format(args.csv_file.name))
+
+        deferred_rows = convert_deferred_rows(converter)
+
+        upload_rows(
+            deferred_rows,
+            total=len(deferred_rows),
+            db=converter.db,
+            max_threads=args.max_threads,
+        )
+
+    client.record_loads.log_stats()
+
     logger.info("Done!")
 
 
@@ -76,6 +113,8 @@ def abort(*_: Any) -> None:  # pragma: no cover
 
 
 def main() -> None:
+    multiprocessing.freeze_support()
+
     signal.signal(signal.SIGINT, abort)
 
     try:
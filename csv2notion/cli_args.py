@@ -51,6 +51,27 @@ def parse_args(argv: Sequence[str]) -> argparse.Namespace:
                 "help": "upload threads (default: 5)",
                 "metavar": "NUMBER",
             },
+            "--max-processes": {
+                "type": lambda x: max(int(x), 1),
+                "default": 1,
+                "help": "CSV conversion processes (default: 1)",
+                "metavar": "NUMBER",
+            },
+            "--stream-upload": {
+                "action": "store_true",
+                "help": (
+                    "start uploading rows while CSV is still being converted;"
+                    "\nconversion errors will stop the upload midway"
+                ),
+            },
+            "--rows-cache": {
+                "type": Path,
+                "metavar": "FILE",
+                "help": (
+                    "file to keep DB row keys between runs;"
+                    "\nspeeds up merge and relation lookups in big DBs"
+                ),
+            },
             "--log": {
                 "type": Path,
                 "metavar": "FILE",
@@ -1,7 +1,6 @@
 import logging
 from argparse import Namespace
-from functools import partial
-from typing import List
+from typing import Iterable, List
 
 from tqdm import tqdm
 
@@ -42,34 +41,42 @@ def new_database(
     return collection_id
 
 
-def convert_csv_to_notion_rows(
+def get_row_converter(
     csv_data: CSVData, client: NotionClientExtended, collection_id: str, args: Namespace
-) -> List[NotionUploadRow]:
+) -> NotionRowConverter:
     notion_db = NotionDB(client, collection_id)
 
     conversion_rules = ConversionRules.from_args(args)
 
     NotionPreparator(notion_db, csv_data, conversion_rules).prepare()
 
-    converter = NotionRowConverter(notion_db, conversion_rules)
+    return NotionRowConverter(notion_db, conversion_rules)
+
+
+def convert_csv_to_notion_rows(
+    csv_data: CSVData, converter: NotionRowConverter, args: Namespace
+) -> Iterable[NotionUploadRow]:
+    if args.stream_upload:
+        return converter.iter_notion_rows(csv_data)
+
     return converter.convert_to_notion_rows(csv_data)
 
 
+def convert_deferred_rows(converter: NotionRowConverter) -> List[NotionUploadRow]:
+    return list(converter.iter_deferred_rows())
+
+
 def upload_rows(
-    notion_rows: List[NotionUploadRow],
-    client: NotionClientExtended,
-    collection_id: str,
-    is_merge: bool,
+    notion_rows: Iterable[NotionUploadRow],
+    total: int,
+    db: NotionDB,
     max_threads: int,
 ) -> None:
-    worker = partial(
-        ThreadRowUploader(client, collection_id).worker,
-        is_merge=is_merge,
-    )
+    worker = ThreadRowUploader(db).worker
 
     tdqm_iter = tqdm(
         iterable=process_iter(worker, notion_rows, max_workers=max_threads),
-        total=len(notion_rows),
+        total=total,
         leave=False,
     )
 
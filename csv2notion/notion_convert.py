@@ -1,7 +1,21 @@
 import logging
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from functools import partial
 from pathlib import Path
-from typing import Any, Callable, Dict, List, Optional
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
 
 from notion.user import User
 from notion.utils import InvalidNotionIdentifier, extract_id
@@ -15,16 +29,56 @@ from csv2notion.notion_convert_map import (
     map_number,
     map_url_or_file,
 )
+from csv2notion.notion_convert_pool import PURE_CONVERSION_MAP, map_columns_parallel
+from csv2notion.notion_convert_vector import get_vector_map
 from csv2notion.notion_db import NotionDB
 from csv2notion.notion_row import CollectionRowBlockExtended
 from csv2notion.notion_type_guess import is_email
 from csv2notion.notion_uploader import NotionUploadRow
 from csv2notion.utils_exceptions import NotionError, TypeConversionError
+from csv2notion.utils_file import DirectoryIndex
 from csv2notion.utils_static import ConversionRules, FileType
 from csv2notion.utils_str import split_str
 
 logger = logging.getLogger(__name__)
 
+POST_PROPERTY_TYPES = frozenset(("created_time", "last_edited_time"))
+
+# column types that are resolved once per distinct value
+RESOLVE_ONCE_TYPES = frozenset(("relation", "person", "file"))
+
+RelationRows = Dict[str, CollectionRowBlockExtended]
+
+# relation to a row of the uploaded CSV is kept as key until the row is created
+RelationRef = Union[str, CollectionRowBlockExtended]
+
+# relation column is None if it failed to convert
+RelationRefs = Optional[List[RelationRef]]
+
+# resolved value and conversion errors to report on each occurrence
+Resolved = Tuple[Any, List[str]]
+
+
+@dataclass
+class ColumnPlan(object):
+    col_type: str
+    convert: Callable[[str], Any]
+    is_mandatory: bool
+    post_property: Optional[str] = None
+    is_precomputed: bool = False
+    is_deferred: bool = False
+
+
+# values that can only be set after the row itself is created
+@dataclass
+class DeferredRow(object):
+    row_number: int
+    key: str
+    upload_row: NotionUploadRow
+    columns: Dict[str, Any]
+    properties: Dict[str, Any]
+    relations: Dict[str, RelationRefs]
+
 
 class NotionRowConverter(object):  # noqa:  WPS214
     def __init__(self, db: NotionDB, conversion_rules: ConversionRules):
@@ -32,33 +86,189 @@ class NotionRowConverter(object):  # noqa:  WPS214
         self.rules = conversion_rules
 
         self._current_row = 0
+        self._plan: Dict[str, ColumnPlan] = {}
+        self._relation_url_ids: Dict[str, List[str]] = {}
+        self._relation_keys: Dict[str, List[str]] = {}
+        self._relation_rows_by_url: Dict[str, RelationRows] = {}
+        self._relation_rows_by_key: Dict[str, RelationRows] = {}
+        self._merge_rows: RelationRows = {}
+        self._csv_keys: Set[str] = set()
+        self._new_rows: Dict[str, NotionUploadRow] = {}
+        self._resolved: Dict[str, Dict[str, Resolved]] = {}
+        self._resolved_hits: Counter[str] = Counter()
+        self._captured_errors: Optional[List[str]] = None
+        self._files = DirectoryIndex()
+        self._deferred_rows: List[DeferredRow] = []
 
     def convert_to_notion_rows(self, csv_data: CSVData) -> List[NotionUploadRow]:
-        notion_rows = []
+        return list(self.iter_notion_rows(csv_data))
+
+    def count_notion_rows(self, csv_data: CSVData) -> int:
+        keys = csv_data.col_values(csv_data.key_column)
+        if not self.rules.merge:
+            return len(keys)
+
+        # repeated new keys update the row created by their first occurrence
+        merge_rows = self.db.get_rows_by_key(keys)
+        new_keys = [k for k in keys if k and k not in merge_rows]
+        return len(keys) - len(new_keys) + len(set(new_keys))
+
+    def iter_notion_rows(self, csv_data: CSVData) -> Iterator[NotionUploadRow]:
+        self._plan = self._compile_plan(csv_data.columns)
+        self._relation_url_ids = self._collect_relation_url_ids(csv_data)
+        self._relation_keys = self._collect_relation_keys(csv_data)
+        self._csv_keys = set(csv_data.col_values(csv_data.key_column))
+        if self.rules.merge:
+            self._merge_rows = self.db.get_rows_by_key(
+                csv_data.col_values(csv_data.key_column)
+            )
+        self._prefetch_persons(csv_data)
+        self._prefetch_relations()
+        if self.rules.add_missing_relations:
+            self._add_missing_relations(csv_data)
+        self._vectorize_plan(csv_data)
+        if self.rules.max_processes > 1:
+            self._parallelize_plan(csv_data)
 
         # starting with 2nd row, because first is header
         self._current_row = 2
 
         for row in csv_data:
             try:
-                notion_rows.append(self._convert_row(row))
+                notion_row = self._convert_row(row)
             except NotionError as e:
                 raise NotionError(f"CSV [{self._current_row}]: {e}")
             self._current_row += 1
 
-        return notion_rows
+            if notion_row is not None:
+                yield notion_row
+
+        self._log_resolved_stats()
+
+    @property
+    def has_deferred_rows(self) -> bool:
+        return bool(self._deferred_rows)
+
+    def iter_deferred_rows(self) -> Iterator[NotionUploadRow]:
+        db_rows = self._get_deferred_db_rows()
+
+        # later rows for the same row override earlier ones, as with merge
+        upload_rows: Dict[str, NotionUploadRow] = {}
+
+        for deferred_row in self._deferred_rows:
+            self._current_row = deferred_row.row_number
+
+            try:
+                self._bind_deferred_row(deferred_row, db_rows, upload_rows)
+            except NotionError as e:
+                raise NotionError(f"CSV [{self._current_row}]: {e}")
+
+        yield from upload_rows.values()
 
     def _error(self, error: str) -> None:
+        if self._captured_errors is not None:
+            self._captured_errors.append(error)
+            return
+
         logger.error(f"CSV [{self._current_row}]: {error}")
 
         if self.rules.fail_on_conversion_error:
             raise NotionError("Error during conversion.")
 
-    def _convert_row(self, row: CSVRowType) -> NotionUploadRow:
+    def _convert_row(self, row: CSVRowType) -> Optional[NotionUploadRow]:
+        key = next(iter(row.values()))
+        merge_row = self._merge_rows.get(key)
+
         properties = self._map_properties(row)
-        columns = self._map_columns(row)
+        columns, relations = self._map_columns(row)
+
+        # row with a new key is created by its first occurrence, update it after
+        first_row = self._new_rows.get(key) if merge_row is None else None
+        if first_row is not None and self.rules.merge:
+            self._defer_row(key, first_row, columns, properties, relations)
+            return None
+
+        notion_row = NotionUploadRow(
+            columns=columns,
+            properties=properties,
+            row_id=merge_row.id if merge_row else None,
+        )
+
+        if merge_row is None and key:
+            self._new_rows.setdefault(key, notion_row)
+
+        # empty values clear relations of existing rows
+        if any(relations.values()) or (relations and merge_row is not None):
+            self._defer_row(key, notion_row, {}, {}, relations)
+
+        return notion_row
+
+    def _defer_row(
+        self,
+        key: str,
+        upload_row: NotionUploadRow,
+        columns: Dict[str, Any],
+        properties: Dict[str, Any],
+        relations: Dict[str, RelationRefs],
+    ) -> None:
+        self._deferred_rows.append(
+            DeferredRow(
+                row_number=self._current_row,
+                key=key,
+                upload_row=upload_row,
+                columns=columns,
+                properties=properties,
+                relations=relations,
+            )
+        )
+
+    def _bind_deferred_row(
+        self,
+        deferred_row: DeferredRow,
+        db_rows: RelationRows,
+        upload_rows: Dict[str, NotionUploadRow],
+    ) -> None:
+        # id is set by uploader when the row is created
+        row_id = deferred_row.upload_row.row_id
+        if row_id is None:
+            self._error(f"Row '{deferred_row.key}' was not created during upload.")
+            return
+
+        upload_row = upload_rows.setdefault(
+            row_id, NotionUploadRow(columns={}, properties={}, row_id=row_id)
+        )
+
+        upload_row.columns.update(deferred_row.columns)
+        upload_row.properties.update(deferred_row.properties)
+
+        for col_key, relation_refs in deferred_row.relations.items():
+            upload_row.columns[col_key] = self._bind_relation_refs(
+                col_key, relation_refs or [], db_rows
+            )
+
+    def _bind_relation_refs(
+        self,
+        relation_column: str,
+        relation_refs: List[RelationRef],
+        db_rows: RelationRows,
+    ) -> List[CollectionRowBlockExtended]:
+        bound_relations: List[CollectionRowBlockExtended] = []
+
+        for relation_ref in relation_refs:
+            if isinstance(relation_ref, str):
+                bound_relation = db_rows.get(relation_ref)
+            else:
+                bound_relation = relation_ref
 
-        return NotionUploadRow(columns=columns, properties=properties)
+            if bound_relation is None:
+                self._error(
+                    f"Value '{relation_ref}' for relation"
+                    f" '{relation_column} [column]' not found in DB after upload."
+                )
+            elif bound_relation not in bound_relations:
+                bound_relations.append(bound_relation)
+
+        return bound_relations
 
     def _map_properties(self, row: CSVRowType) -> Dict[str, Any]:
         properties = {}
@@ -71,28 +281,12 @@ class NotionRowConverter(object):  # noqa:  WPS214
 
         properties["icon"] = self._map_icon(row)
 
-        properties["created_time"] = self._pop_column_type(row, "created_time")
-        properties["last_edited_time"] = self._pop_column_type(row, "last_edited_time")
+        properties.update(self._pop_post_properties(row))
 
         return {k: v for k, v in properties.items() if v is not None}
 
-    def _map_columns(self, row: CSVRowType) -> Dict[str, Any]:
-        notion_row = {}
-
-        for col_key, col_value in row.items():
-            col_type = self.db.columns[col_key]["type"]
-
-            notion_row[col_key] = self._map_column(col_key, col_value, col_type)
-
-            self._raise_if_mandatory_empty(col_key, notion_row[col_key])
-
-        return notion_row
-
-    def _map_column(
-        self, col_key: str, col_value: str, value_type: str
-    ) -> Optional[Any]:
+    def _compile_plan(self, columns: Iterable[str]) -> Dict[str, ColumnPlan]:
         conversion_map: Dict[str, Callable[[str], Any]] = {
-            "relation": partial(self._map_relation, col_key),
             "checkbox": map_checkbox,
             "date": map_notion_date,
             "created_time": map_date,
@@ -103,37 +297,123 @@ class NotionRowConverter(object):  # noqa:  WPS214
             "person": self._map_person,
         }
 
+        plan = {}
+
+        for col_key in columns:
+            if col_key not in self.db.columns:
+                continue
+
+            col_type = self.db.columns[col_key]["type"]
+
+            is_deferred = self._is_self_relation(col_key)
+
+            convert: Callable[[str], Any]
+            if is_deferred:
+                convert = partial(self._map_deferred_relation, col_key)
+            elif col_type == "relation":
+                convert = partial(self._map_relation, col_key)
+            else:
+                convert = conversion_map.get(col_type, _keep_value)
+
+            if col_type in RESOLVE_ONCE_TYPES:
+                convert = partial(self._resolve_once, col_key, convert)
+
+            plan[col_key] = ColumnPlan(
+                col_type=col_type,
+                convert=convert,
+                is_mandatory=col_key in self.rules.mandatory_column,
+                post_property=col_type if col_type in POST_PROPERTY_TYPES else None,
+                is_deferred=is_deferred,
+            )
+
+        return plan
+
+    def _vectorize_plan(self, csv_data: CSVData) -> None:
+        vector_map = get_vector_map(p.col_type for p in self._plan.values())
+
+        for col_key, column_plan in self._plan.items():
+            if column_plan.col_type not in vector_map:
+                continue
+
+            col_values = csv_data.col_values(col_key)
+            converted = vector_map[column_plan.col_type](col_values)
+
+            column_plan.convert = partial(
+                _map_precomputed,
+                dict(zip(col_values, converted)),
+                column_plan.convert,
+            )
+            column_plan.is_precomputed = True
+
+    def _parallelize_plan(self, csv_data: CSVData) -> None:
+        pure_columns = {
+            col_key: (column_plan.col_type, csv_data.col_values(col_key))
+            for col_key, column_plan in self._plan.items()
+            if column_plan.col_type in PURE_CONVERSION_MAP
+            and not column_plan.is_precomputed
+        }
+
+        if not pure_columns:
+            return
+
+        converted_columns = map_columns_parallel(
+            pure_columns, max_workers=self.rules.max_processes
+        )
+
+        for col_key, converted in converted_columns.items():
+            column_plan = self._plan[col_key]
+            column_plan.convert = partial(
+                _map_precomputed, converted, column_plan.convert
+            )
+            column_plan.is_precomputed = True
+
+    # relations to rows of the same DB are set only after rows are created
+    def _map_columns(
+        self, row: CSVRowType
+    ) -> Tuple[Dict[str, Optional[Any]], Dict[str, RelationRefs]]:
+        notion_row: Dict[str, Optional[Any]] = {}
+        relations: Dict[str, RelationRefs] = {}
+
+        for col_key, col_value in row.items():
+            if self._plan[col_key].is_deferred:
+                relations[col_key] = self._map_column(col_key, col_value)
+            else:
+                notion_row[col_key] = self._map_column(col_key, col_value)
+
+        return notion_row, relations
+
+    def _map_column(self, col_key: str, col_value: str) -> Optional[Any]:
+        column_plan = self._plan[col_key]
+
         try:
-            return conversion_map[value_type](col_value)
-        except KeyError:
-            return col_value
+            result_value = column_plan.convert(col_value)
         except TypeConversionError as e:
-            if not col_value.strip():
-                return None
+            result_value = None
 
-            self._error(str(e))
-            return None
+            if col_value.strip():
+                self._error(str(e))
 
-    def _pop_column_type(self, row: CSVRowType, col_type_to_pop: str) -> Optional[Any]:
-        """Some column types can't have multiple values (like created_time)
-        so we pop them out of the row leaving only the last non-empty one"""
+        if column_plan.is_mandatory and not result_value:
+            raise NotionError(f"Mandatory column '{col_key}' is empty")
 
-        last_col_value = None
+        return result_value
 
-        for col_key, col_value in list(row.items()):
-            col_type = self.db.columns[col_key]["type"]
+    def _pop_post_properties(self, row: CSVRowType) -> Dict[str, Any]:
+        """Some column types can't have multiple values (like created_time)
+        so we pop them out of the row leaving only the last non-empty one"""
 
-            if col_type == col_type_to_pop:
-                result_value = self._map_column(col_key, col_value, col_type)
+        post_properties = {}
 
-                self._raise_if_mandatory_empty(col_key, result_value)
+        for col_key, column_plan in self._plan.items():
+            if column_plan.post_property is None or col_key not in row:
+                continue
 
-                if result_value is not None:
-                    last_col_value = result_value
+            result_value = self._map_column(col_key, row.pop(col_key))
 
-                row.pop(col_key)
+            if result_value is not None:
+                post_properties[column_plan.post_property] = result_value
 
-        return last_col_value
+        return post_properties
 
     def _map_icon(self, row: CSVRowType) -> Optional[FileType]:
         icon: Optional[FileType] = None
@@ -141,9 +421,9 @@ class NotionRowConverter(object):  # noqa:  WPS214
         if self.rules.icon_column:
             icon = row.get(self.rules.icon_column, "").strip()
             if icon:
-                icon = map_icon(icon)
-                if isinstance(icon, Path):
-                    icon = self._relative_path(icon)
+                icon = self._resolve_once(
+                    f"{self.rules.icon_column} (icon)", self._resolve_icon, icon
+                )
 
             self._raise_if_mandatory_empty(self.rules.icon_column, icon)
 
@@ -161,9 +441,9 @@ class NotionRowConverter(object):  # noqa:  WPS214
         if self.rules.image_column:
             image = row.get(self.rules.image_column, "").strip()
             if image:
-                image = map_url_or_file(image)
-                if isinstance(image, Path):
-                    image = self._relative_path(image)
+                image = self._resolve_once(
+                    f"{self.rules.image_column} (image)", self._resolve_image, image
+                )
 
             self._raise_if_mandatory_empty(self.rules.image_column, image)
 
@@ -172,6 +452,58 @@ class NotionRowConverter(object):  # noqa:  WPS214
 
         return image
 
+    def _resolve_icon(self, icon: str) -> Optional[FileType]:
+        icon_filetype = map_icon(icon)
+        if isinstance(icon_filetype, Path):
+            return self._relative_path(icon_filetype)
+
+        return icon_filetype
+
+    def _resolve_image(self, image: str) -> Optional[FileType]:
+        image_filetype = map_url_or_file(image)
+        if isinstance(image_filetype, Path):
+            return self._relative_path(image_filetype)
+
+        return image_filetype
+
+    # errors of a value are reported again for each row that has it
+    def _resolve_once(
+        self, cache_key: str, resolve: Callable[[str], Any], col_value: str
+    ) -> Any:
+        resolved = self._resolved.setdefault(cache_key, {})
+
+        try:
+            resolved_value, errors = resolved[col_value]
+        except KeyError:
+            resolved_value, errors = self._capture_errors(resolve, col_value)
+            resolved[col_value] = (resolved_value, errors)
+        else:
+            self._resolved_hits[cache_key] += 1
+
+        for error in errors:
+            self._error(error)
+
+        return resolved_value
+
+    def _capture_errors(
+        self, resolve: Callable[[str], Any], col_value: str
+    ) -> Resolved:
+        self._captured_errors = []
+
+        try:
+            resolved_value = resolve(col_value)
+        finally:
+            errors, self._captured_errors = self._captured_errors, None
+
+        return resolved_value, errors
+
+    def _log_resolved_stats(self) -> None:
+        for cache_key, resolved in self._resolved.items():
+            logger.debug(
+                f"Column '{cache_key}': {len(resolved)} distinct values resolved,"
+                f" {self._resolved_hits[cache_key]} cache hits"
+            )
+
     def _map_image_caption(self, row: CSVRowType) -> Optional[str]:
         image_caption = None
 
@@ -227,7 +559,7 @@ class NotionRowConverter(object):  # noqa:  WPS214
         if not path.is_absolute():
             path = search_path / path
 
-        if not path.exists():
+        if not self._files.exists(path):
             self._error(f"File {path.name} does not exist.")
             return None
 
@@ -240,7 +572,7 @@ class NotionRowConverter(object):  # noqa:  WPS214
 
         resolved_relations = []
         for v in col_values:
-            if v.startswith("https://www.notion.so/"):
+            if _is_notion_url(v):
                 resolved_relation = self._resolve_relation_by_url(relation_column, v)
             else:
                 resolved_relation = self._resolve_relation_by_key(relation_column, v)
@@ -250,13 +582,37 @@ class NotionRowConverter(object):  # noqa:  WPS214
 
         return resolved_relations
 
+    # keys of CSV rows are kept as is until those rows are created
+    def _map_deferred_relation(
+        self, relation_column: str, col_value: str
+    ) -> List[RelationRef]:
+        relation_refs: List[RelationRef] = []
+        for v in split_str(col_value):
+            relation_ref: Optional[RelationRef]
+            if _is_notion_url(v):
+                relation_ref = self._resolve_relation_by_url(relation_column, v)
+            elif v in self._csv_keys:
+                relation_ref = v
+            else:
+                relation_ref = self._resolve_relation_by_key(relation_column, v)
+
+            if relation_ref is not None:
+                relation_refs.append(relation_ref)
+
+        return relation_refs
+
     def _resolve_relation_by_key(
         self, relation_column: str, key: str
     ) -> Optional[CollectionRowBlockExtended]:
         relation = self.db.relations[relation_column]
 
+        if relation_column not in self._relation_rows_by_key:
+            self._relation_rows_by_key[relation_column] = relation.get_rows_by_key(
+                self._relation_keys[relation_column]
+            )
+
         try:
-            return relation.rows[key]
+            return self._relation_rows_by_key[relation_column][key]
         except KeyError:
             if self.rules.add_missing_relations:
                 return relation.add_row_key(key)
@@ -277,11 +633,15 @@ class NotionRowConverter(object):  # noqa:  WPS214
             return None
 
         relation = self.db.relations[relation_column]
-        relation_rows = relation.rows.values()
+
+        if relation_column not in self._relation_rows_by_url:
+            self._relation_rows_by_url[relation_column] = relation.get_rows_by_id(
+                self._relation_url_ids[relation_column]
+            )
 
         try:
-            return next(r for r in relation_rows if r.id == block_id)
-        except StopIteration:
+            return self._relation_rows_by_url[relation_column][block_id]
+        except KeyError:
             self._error(
                 f"Row with url '{url}' not found in relation"
                 f" '{relation_column} [column] -> {relation.name} [DB]'."
@@ -289,6 +649,153 @@ class NotionRowConverter(object):  # noqa:  WPS214
 
             return None
 
+    def _is_self_relation(self, col_key: str) -> bool:
+        column = self.db.columns[col_key]
+
+        return bool(
+            column["type"] == "relation"
+            and column["collection_id"] == self.db.collection.id
+        )
+
+    def _get_deferred_db_rows(self) -> RelationRows:
+        relation_keys = [
+            ref
+            for r in self._deferred_rows
+            for refs in r.relations.values()
+            for ref in refs or []
+            if isinstance(ref, str)
+        ]
+
+        # keys of rows created by this run point to them, not to older DB rows
+        db_rows: RelationRows = {}
+        for key in relation_keys:
+            new_row_id = self._new_rows[key].row_id if key in self._new_rows else None
+            if new_row_id is not None:
+                db_rows[key] = self.db.collection.get_row(new_row_id)
+
+        missing_keys = [k for k in relation_keys if k not in db_rows]
+        if missing_keys:
+            db_rows.update(self.db.get_rows_by_key(missing_keys))
+
+        return db_rows
+
+    def _collect_relation_url_ids(self, csv_data: CSVData) -> Dict[str, List[str]]:
+        relation_url_ids: Dict[str, List[str]] = {}
+
+        for col_key, column_plan in self._plan.items():
+            if column_plan.col_type != "relation":
+                continue
+
+            col_ids: List[Optional[str]] = []
+            for col_value in csv_data.col_values(col_key):
+                col_ids.extend(
+                    _extract_id_or_none(v)
+                    for v in split_str(col_value)
+                    if _is_notion_url(v)
+                )
+
+            relation_url_ids[col_key] = list(filter(None, dict.fromkeys(col_ids)))
+
+        return relation_url_ids
+
+    def _collect_relation_keys(self, csv_data: CSVData) -> Dict[str, List[str]]:
+        relation_keys = {}
+
+        for col_key, column_plan in self._plan.items():
+            if column_plan.col_type != "relation":
+                continue
+
+            col_keys: Dict[str, None] = {}
+            for col_value in csv_data.col_values(col_key):
+                col_keys.update(
+                    dict.fromkeys(
+                        v for v in split_str(col_value) if not _is_notion_url(v)
+                    )
+                )
+
+            relation_keys[col_key] = list(col_keys)
+
+        return relation_keys
+
+    def _add_missing_relations(self, csv_data: CSVData) -> None:
+        relations: Dict[str, NotionDB] = {}
+        relation_keys: Dict[str, Dict[str, None]] = {}
+        csv_keys = set(csv_data.col_values(csv_data.key_column))
+
+        for col_key, column_plan in self._plan.items():
+            if column_plan.col_type != "relation":
+                continue
+
+            relation = self.db.relations[col_key]
+            relations[relation.collection.id] = relation
+
+            # keys of the uploaded DB itself will be added by the upload
+            col_keys = self._relation_keys[col_key]
+            if column_plan.is_deferred:
+                col_keys = [k for k in col_keys if k not in csv_keys]
+
+            relation_keys.setdefault(relation.collection.id, {}).update(
+                dict.fromkeys(col_keys)
+            )
+
+        for collection_id, relation in relations.items():
+            keys = list(relation_keys[collection_id])
+            existing_rows = relation.get_rows_by_key(keys)
+            missing_keys = [k for k in keys if k not in existing_rows]
+
+            if not missing_keys:
+                continue
+
+            logger.info(
+                f"Adding {len(missing_keys)} missing rows into '{relation.name}' DB"
+            )
+
+            relation.add_row_keys(missing_keys, max_workers=self.rules.max_threads)
+
+    def _prefetch_relations(self) -> None:
+        relations: Dict[str, NotionDB] = {}
+        relation_keys: Dict[str, Dict[str, None]] = {}
+        relation_url_ids: Dict[str, Dict[str, None]] = {}
+
+        for col_key, column_plan in self._plan.items():
+            # rows of the uploaded DB itself are looked up after upload
+            if column_plan.col_type != "relation" or column_plan.is_deferred:
+                continue
+
+            relation = self.db.relations[col_key]
+            relations[relation.collection.id] = relation
+
+            relation_keys.setdefault(relation.collection.id, {}).update(
+                dict.fromkeys(self._relation_keys[col_key])
+            )
+            relation_url_ids.setdefault(relation.collection.id, {}).update(
+                dict.fromkeys(self._relation_url_ids[col_key])
+            )
+
+        with ThreadPoolExecutor(max_workers=self.rules.max_threads) as executor:
+            futures = [
+                executor.submit(
+                    _prefetch_relation_rows,
+                    relation,
+                    list(relation_keys[collection_id]),
+                    list(relation_url_ids[collection_id]),
+                )
+                for collection_id, relation in relations.items()
+            ]
+
+            for future in futures:
+                future.result()
+
+    def _prefetch_persons(self, csv_data: CSVData) -> None:
+        persons = set()
+
+        for col_key, column_plan in self._plan.items():
+            if column_plan.col_type == "person":
+                for col_value in set(csv_data.col_values(col_key)):
+                    persons.update(split_str(col_value))
+
+        self.db.prefetch_users(persons, max_workers=self.rules.max_threads)
+
     def _extract_id(self, url: str) -> Optional[str]:
         try:
             return str(extract_id(url))
@@ -326,5 +833,40 @@ class NotionRowConverter(object):  # noqa:  WPS214
             raise NotionError(f"Mandatory column '{col_key}' is empty")
 
 
+def _map_precomputed(
+    converted: Dict[str, Any], fallback: Callable[[str], Any], col_value: str
+) -> Any:
+    converted_value = converted.get(col_value)
+    if converted_value is None:
+        return fallback(col_value)
+
+    if isinstance(converted_value, TypeConversionError):
+        raise TypeConversionError(str(converted_value))
+
+    return converted_value
+
+
+def _is_notion_url(s: str) -> bool:
+    return s.startswith("https://www.notion.so/")
+
+
+def _extract_id_or_none(url: str) -> Optional[str]:
+    try:
+        return str(extract_id(url))
+    except InvalidNotionIdentifier:
+        return None
+
+
+def _keep_value(col_value: str) -> str:
+    return col_value
+
+
 def _is_banned_extension(file_path: Path) -> bool:
     return file_path.suffix in {".exe", ".com", ".js"}
+
+
+def _prefetch_relation_rows(
+    relation: NotionDB, keys: List[str], row_ids: List[str]
+) -> None:
+    relation.get_rows_by_key(keys)
+    relation.get_rows_by_id(row_ids)
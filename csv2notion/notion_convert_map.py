@@ -1,10 +1,11 @@
+import re
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional, Union
 
 from dateutil.parser import ParserError
 from dateutil.parser import parse as date_parse
-from emoji import distinct_emoji_list, emoji_count, replace_emoji
 from notion.collection import NotionDate
 
 from csv2notion.notion_type_guess import is_url
@@ -12,16 +13,19 @@ from csv2notion.utils_exceptions import TypeConversionError
 from csv2notion.utils_static import FileType
 from csv2notion.utils_str import split_str
 
+DATE_CACHE_SIZE = 4096
+ICON_CACHE_SIZE = 1024
+
+# fromisoformat accepts more on newer Python, only take shapes dateutil agrees on
+ISO_DATE_RE = re.compile(r"\d{4}-\d{2}-\d{2}([T ]\d{2}:\d{2}(:\d{2})?)?")
+
 
 def map_checkbox(s: str) -> bool:
     return s == "true"
 
 
 def map_date(s: str) -> datetime:
-    try:
-        return date_parse(s)
-    except ParserError as e:
-        raise TypeConversionError(e) from e
+    return _parse_date(s)
 
 
 def map_notion_date(s: str) -> NotionDate:
@@ -63,7 +67,25 @@ def map_url_or_file(s: str) -> FileType:
     return s if is_url(s) else Path(s)
 
 
+@lru_cache(maxsize=DATE_CACHE_SIZE)
+def _parse_date(s: str) -> datetime:
+    if ISO_DATE_RE.fullmatch(s):
+        try:
+            return datetime.fromisoformat(s)
+        except ValueError:
+            pass  # noqa: WPS420
+
+    try:
+        return date_parse(s)
+    except ParserError as e:
+        raise TypeConversionError(e) from e
+
+
+@lru_cache(maxsize=ICON_CACHE_SIZE)
 def _get_icon_emoji(s: str) -> Optional[str]:
+    # emoji tables are big, load them only when icons are actually used
+    from emoji import distinct_emoji_list, emoji_count, replace_emoji  # noqa: WPS433
+
     # string has anything other than emoji
     if replace_emoji(s) != "":
         return None
@@ -0,0 +1,54 @@
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, List, Mapping, Sequence, Tuple
+
+from csv2notion.notion_convert_map import map_date, map_notion_date, map_number
+from csv2notion.utils_exceptions import TypeConversionError
+from csv2notion.utils_iter import chunks
+
+CHUNK_SIZE = 1000
+
+# column types that can be converted without access to Notion
+PURE_CONVERSION_MAP: Dict[str, Callable[[str], Any]] = {
+    "date": map_notion_date,
+    "created_time": map_date,
+    "last_edited_time": map_date,
+    "number": map_number,
+}
+
+ColumnValues = Tuple[str, Sequence[str]]
+
+
+# values that failed to convert are returned as TypeConversionError
+def map_columns_parallel(
+    columns: Mapping[str, ColumnValues], max_workers: int
+) -> Dict[str, Dict[str, Any]]:
+    tasks = [
+        (col_key, col_type, chunk)
+        for col_key, (col_type, col_values) in columns.items()
+        for chunk in chunks(list(dict.fromkeys(col_values)), CHUNK_SIZE)
+    ]
+
+    converted: Dict[str, Dict[str, Any]] = {col_key: {} for col_key in columns}
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = [
+            executor.submit(_map_chunk, col_type, chunk) for _, col_type, chunk in tasks
+        ]
+
+        for (col_key, _, _), future in zip(tasks, futures):
+            converted[col_key].update(future.result())
+
+    return converted
+
+
+def _map_chunk(col_type: str, col_values: List[str]) -> Dict[str, Any]:
+    convert = PURE_CONVERSION_MAP[col_type]
+
+    converted: Dict[str, Any] = {}
+    for col_value in col_values:
+        try:
+            converted[col_value] = convert(col_value)
+        except TypeConversionError as e:
+            converted[col_value] = TypeConversionError(str(e))
+
+    return converted
@@ -0,0 +1,79 @@
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Union
+
+Number = Union[int, float]
+
+VECTOR_TYPES = frozenset(("number", "checkbox"))
+
+
+# invalid cells are left as None
+def map_number_column(col_values: Sequence[str]) -> List[Optional[Number]]:
+    import numpy as np  # noqa: WPS433
+
+    numbers, is_valid = _parse_floats(col_values)
+
+    # nan and inf cells are not integers, no need to warn about them
+    with np.errstate(invalid="ignore"):
+        is_integer = is_valid & np.isfinite(numbers) & (np.mod(numbers, 1) == 0)
+
+    return [
+        (int(n) if is_int else n) if valid else None
+        for n, valid, is_int in zip(
+            numbers.tolist(), is_valid.tolist(), is_integer.tolist()
+        )
+    ]
+
+
+def map_checkbox_column(col_values: Sequence[str]) -> List[bool]:
+    import numpy as np  # noqa: WPS433
+
+    return (np.asarray(col_values, dtype=np.str_) == "true").tolist()  # type: ignore
+
+
+# NumPy takes a while to import, so it's loaded only for columns that need it
+def get_vector_map(
+    col_types: Iterable[str] = VECTOR_TYPES,
+) -> Dict[str, Callable[[Sequence[str]], List[Any]]]:
+    if VECTOR_TYPES.isdisjoint(col_types):
+        return {}
+
+    try:
+        import numpy  # noqa: F401, WPS433
+    except ImportError:  # pragma: no cover
+        return {}
+
+    return {
+        "number": map_number_column,
+        "checkbox": map_checkbox_column,
+    }
+
+
+def _parse_floats(col_values: Sequence[str]) -> Any:
+    import numpy as np  # noqa: WPS433
+
+    raw_values = np.char.strip(np.asarray(col_values, dtype=np.str_))
+    is_valid = raw_values != ""
+
+    try:
+        numbers = np.where(is_valid, raw_values, "0").astype(np.float64)
+    except ValueError:
+        numbers, is_valid = _parse_floats_unique(raw_values, is_valid)
+
+    return numbers, is_valid
+
+
+def _parse_floats_unique(raw_values: Any, is_valid: Any) -> Any:
+    import numpy as np  # noqa: WPS433
+
+    unique_values, inverse = np.unique(raw_values, return_inverse=True)
+
+    unique_numbers = np.zeros(len(unique_values), dtype=np.float64)
+    unique_valid = np.zeros(len(unique_values), dtype=bool)
+
+    for i, unique_value in enumerate(unique_values.tolist()):
+        try:
+            unique_numbers[i] = float(unique_value)
+        except ValueError:
+            continue
+        unique_valid[i] = True
+
+    return unique_numbers[inverse], is_valid & unique_valid[inverse]
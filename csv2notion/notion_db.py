@@ -1,27 +1,54 @@
-from typing import Any, Dict, List, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+)
 
 import requests
 from notion.user import User
 from notion.utils import InvalidNotionIdentifier
 
 from csv2notion.csv_data import CSVData
+from csv2notion.notion_db_cache import RowCache
 from csv2notion.notion_db_client import NotionClientExtended
 from csv2notion.notion_db_collection import CollectionExtended
+from csv2notion.notion_db_rows import RowIndex, RowIndexes
 from csv2notion.notion_row import CollectionRowBlockExtended
+from csv2notion.notion_type_guess import is_email
 from csv2notion.utils_db import make_status_column
 from csv2notion.utils_exceptions import NotionError
 from csv2notion.utils_rand_id import rand_id_list
 
+# rows are looked up one by one if DB has this many times more rows than requested
+ROW_LOOKUP_RATIO = 100
+
 
 class NotionDB(object):  # noqa: WPS214
-    def __init__(self, client: NotionClientExtended, collection_id: str):
+    def __init__(
+        self,
+        client: NotionClientExtended,
+        collection_id: str,
+        row_indexes: Optional[RowIndexes] = None,
+    ):
         self.client = client
         self.collection = CollectionExtended(self.client, collection_id)
 
+        # row indexes are shared by DBs of all threads and relations
+        self.row_indexes = row_indexes if row_indexes is not None else {}
+        self._rows = self.row_indexes.setdefault(self.collection.id, RowIndex())
+
         self._cache_columns: Dict[str, Dict[str, str]] = {}
         self._cache_relations: Dict[str, NotionDB] = {}
-        self._cache_rows: Dict[str, CollectionRowBlockExtended] = {}
         self._cache_users: Dict[str, User] = {}
+        self._cache_users_by_name: Dict[str, User] = {}
+        self._cache_missing_emails: Set[str] = set()
 
     @property
     def name(self) -> str:
@@ -38,23 +65,80 @@ class NotionDB(object):  # noqa: WPS214
 
     @property
     def key_column(self) -> str:
-        column_values = self.columns.values()
-        return next(c["name"] for c in column_values if c["type"] == "title")
+        return self.collection.schema_index.key_column
 
     @property
-    def rows(self) -> Dict[str, CollectionRowBlockExtended]:
-        if not self._cache_rows:
-            self._cache_rows = self.collection.get_unique_rows()
+    def row_ids(self) -> Dict[str, str]:
+        with self._rows.lock:
+            if self._rows.row_ids is None:
+                self._rows.row_ids = self._load_row_ids()
 
-        return self._cache_rows
+            return self._rows.row_ids
+
+    @property
+    def row_cache(self) -> Optional[RowCache]:
+        return self.client.options.get("row_cache")
+
+    @property
+    def row_count(self) -> int:
+        with self._rows.lock:
+            if self._rows.row_count is None:
+                self._rows.row_count = self.collection.get_row_count()
+
+            return self._rows.row_count
+
+    def get_rows_by_id(
+        self, row_ids: Sequence[str]
+    ) -> Dict[str, CollectionRowBlockExtended]:
+        with self._rows.lock:
+            ids_by_id = self._rows.ids_by_id
+
+            new_ids = [r_id for r_id in row_ids if r_id not in ids_by_id]
+
+            if new_ids:
+                ids_by_id.update(dict.fromkeys(new_ids))
+                ids_by_id.update(
+                    (r_id, row.id)
+                    for r_id, row in self._find_rows_by_id(new_ids).items()
+                )
+
+            found_ids = {r_id: ids_by_id[r_id] for r_id in row_ids}
+
+        return self._get_rows(found_ids)
+
+    def get_rows_by_key(
+        self, keys: Sequence[str]
+    ) -> Dict[str, CollectionRowBlockExtended]:
+        with self._rows.lock:
+            ids_by_key = self._rows.ids_by_key
+
+            new_keys = [k for k in dict.fromkeys(keys) if k not in ids_by_key]
+
+            if new_keys:
+                ids_by_key.update(dict.fromkeys(new_keys))
+                ids_by_key.update(
+                    (k, row.id) for k, row in self._find_rows_by_key(new_keys).items()
+                )
+
+            found_ids = {k: ids_by_key[k] for k in keys}
+
+        return self._get_rows(found_ids)
 
     @property
     def relations(self) -> Dict[str, "NotionDB"]:
         if not self._cache_relations:
             relations = [c for c in self.columns.values() if c["type"] == "relation"]
 
+            # columns linked to the same DB share it, so it's loaded only once
+            relation_dbs = {
+                r["collection_id"]: NotionDB(
+                    self.client, r["collection_id"], self.row_indexes
+                )
+                for r in relations
+            }
+
             self._cache_relations = {
-                r["name"]: NotionDB(self.client, r["collection_id"]) for r in relations
+                r["name"]: relation_dbs[r["collection_id"]] for r in relations
             }
 
         return self._cache_relations
@@ -66,35 +150,90 @@ class NotionDB(object):  # noqa: WPS214
 
         return self._cache_users
 
+    @property
+    def users_by_name(self) -> Dict[str, User]:
+        if not self._cache_users_by_name:
+            self._index_users_by_name()
+
+        return self._cache_users_by_name
+
     def get_user_by_name(self, name: str) -> Optional[User]:
-        name_match = (u for u in self.users.values() if u.name == name)
-        return next(name_match, None)
+        return self.users_by_name.get(name)
 
     def find_user(self, email: str) -> Optional[User]:
+        if email in self._cache_missing_emails:
+            return None
+
         res = self.client.post("findUser", {"email": email}).json()
 
         try:
             user_id = res["value"]["value"]["id"]
         except KeyError:
+            self._cache_missing_emails.add(email)
             return None
 
         found_user = User(self.client, user_id)
 
         self.users[found_user.email] = found_user
+        if self._cache_users_by_name:
+            self._cache_users_by_name.setdefault(found_user.name, found_user)
 
         return found_user
 
+    def prefetch_users(self, persons: Iterable[str], max_workers: int = 1) -> None:
+        persons = sorted(set(persons))
+        if not persons:
+            return
+
+        unknown_emails = [p for p in persons if is_email(p) and p not in self.users]
+
+        if not self._cache_users_by_name and not all(map(is_email, persons)):
+            self._index_users_by_name()
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            list(executor.map(self.find_user, unknown_emails))
+
+    # checked while loading row index, so DB is fetched once for both
     def has_duplicates(self) -> bool:
-        return self.collection.has_duplicates()
+        with self._rows.lock:
+            if self._rows.row_ids is None:
+                self._rows.row_ids = self._load_row_ids()
+
+            return self._rows.has_duplicates
+
+    # row indexes are shared with DB of the other client
+    def for_client(self, client: NotionClientExtended) -> "NotionDB":
+        return NotionDB(client, self.collection.id, self.row_indexes)
+
+    def get_inaccessible_relations(self) -> List[str]:
+        relation_records = self.client.get_records(
+            "collection",
+            (r.collection.id for r in self.relations.values()),
+            force_refresh=True,
+        )
 
-    def is_accessible(self) -> bool:
-        return self.collection.is_accessible()
+        return [
+            r_col
+            for r_col, r in self.relations.items()
+            if relation_records[r.collection.id] is None
+        ]
 
     def add_column(self, column_name: str, column_type: str) -> None:
         self.collection.add_column(column_name, column_type)
 
         self._cache_columns = {}
-        self._cache_rows = {}
+
+    def add_select_options(
+        self, column_values: Mapping[str, Iterable[str]]
+    ) -> Dict[str, List[str]]:
+        new_options = self.collection.add_select_options(
+            {self.columns[c]["id"]: v for c, v in column_values.items()}
+        )
+
+        self._cache_columns = {}
+
+        column_names = {c["id"]: c["name"] for c in self.columns.values()}
+        return {column_names[c_id]: v for c_id, v in new_options.items()}
 
     def add_row(
         self,
@@ -105,12 +244,139 @@ class NotionDB(object):  # noqa: WPS214
 
         key = columns.get(self.key_column) if columns else None
         if key:
-            self.rows[key] = new_row
+            self._cache_new_rows({key: new_row})
 
         return new_row
 
     def add_row_key(self, key: str) -> CollectionRowBlockExtended:
-        return self.add_row(columns={self.key_column: key})
+        new_row = self.collection.add_row_block(columns={self.key_column: key})
+
+        self._cache_new_rows({key: new_row})
+
+        return new_row
+
+    def add_row_keys(
+        self, keys: Sequence[str], max_workers: int = 1
+    ) -> Dict[str, CollectionRowBlockExtended]:
+        new_rows = self.collection.add_key_rows(keys, max_workers=max_workers)
+
+        self._cache_new_rows(new_rows)
+
+        return new_rows
+
+    def _cache_new_rows(self, new_rows: Dict[str, CollectionRowBlockExtended]) -> None:
+        with self._rows.lock:
+            if self._rows.row_ids is not None:
+                for key, new_row in new_rows.items():
+                    if self._rows.row_ids.setdefault(key, new_row.id) != new_row.id:
+                        self._rows.has_duplicates = True
+
+            for key, new_row in new_rows.items():
+                if self._rows.ids_by_key.get(key) is None:
+                    self._rows.ids_by_key[key] = new_row.id
+
+        if self.row_cache:
+            self.row_cache.update(
+                self.collection.id, {k: row.id for k, row in new_rows.items()}
+            )
+
+    def _load_row_ids(self) -> Dict[str, str]:
+        row_ids, self._rows.has_duplicates = self.collection.get_unique_row_ids(
+            limit=self._pop_row_count()
+        )
+
+        if self.row_cache:
+            self.row_cache.replace(self.collection.id, row_ids)
+
+        return row_ids
+
+    def _get_rows(
+        self, row_ids: Dict[str, Optional[str]]
+    ) -> Dict[str, CollectionRowBlockExtended]:
+        return {
+            k: self.collection.get_row(r_id)
+            for k, r_id in row_ids.items()
+            if r_id is not None
+        }
+
+    def _index_users_by_name(self) -> None:
+        for user in self.users.values():
+            self._cache_users_by_name.setdefault(user.name, user)
+
+    def _is_full_load_cheaper(self, lookups_count: int) -> bool:
+        if self._rows.row_ids is not None:
+            return True
+
+        return self.row_count <= lookups_count * ROW_LOOKUP_RATIO
+
+    def _find_rows_by_id(
+        self, row_ids: Sequence[str]
+    ) -> Dict[str, CollectionRowBlockExtended]:
+        if self._is_full_load_cheaper(len(row_ids)):
+            db_row_ids = set(self.row_ids.values())
+            return {
+                r_id: self.collection.get_row(r_id)
+                for r_id in row_ids
+                if r_id in db_row_ids
+            }
+
+        return self.collection.get_rows_by_id(row_ids)
+
+    def _find_rows_by_key(
+        self, keys: Sequence[str]
+    ) -> Dict[str, CollectionRowBlockExtended]:
+        # fetching cached rows by id is cheaper than a full load of a big DB
+        if self.row_cache and self._rows.row_ids is None:
+            return self._find_rows_by_cached_key(keys, self.row_cache)
+
+        return self._find_rows_by_uncached_key(keys)
+
+    def _find_rows_by_uncached_key(
+        self, keys: Sequence[str]
+    ) -> Dict[str, CollectionRowBlockExtended]:
+        if self._is_full_load_cheaper(len(keys)):
+            return {
+                k: self.collection.get_row(self.row_ids[k])
+                for k in keys
+                if k in self.row_ids
+            }
+
+        return self.collection.get_rows_by_title(keys)
+
+    # cached ids are only hints, rows could have changed since they were cached
+    def _find_rows_by_cached_key(
+        self, keys: Sequence[str], row_cache: RowCache
+    ) -> Dict[str, CollectionRowBlockExtended]:
+        cached_ids = row_cache.get_row_ids(self.collection.id, keys)
+        cached_rows = self.collection.get_rows_by_id(list(cached_ids.values()))
+
+        rows = {}
+        for key, row_id in cached_ids.items():
+            row = cached_rows.get(row_id)
+            if row is not None and row.title == key:
+                rows[key] = row
+
+        missing_keys = [k for k in keys if k not in rows]
+        if missing_keys:
+            found_rows = self._find_rows_by_uncached_key(missing_keys)
+            rows.update(found_rows)
+
+            row_cache.remove(
+                self.collection.id, (k for k in missing_keys if k in cached_ids)
+            )
+            row_cache.update(
+                self.collection.id, {k: row.id for k, row in found_rows.items()}
+            )
+
+        return rows
+
+    # row count is fetched before each full load anyway, so it's reused once
+    def _pop_row_count(self) -> int:
+        if self._rows.row_count is None:
+            return -1
+
+        row_count, self._rows.row_count = self._rows.row_count, None
+        return row_count
 
 
 def get_collection_id(client: NotionClientExtended, notion_url: str) -> str:
@@ -199,12 +465,14 @@ def _schema_from_csv(
     return schema
 
 
-def get_notion_client(token: str, **options: Dict[str, Any]) -> NotionClientExtended:
+def get_notion_client(
+    token: str, row_cache: Optional[RowCache] = None, **options: Dict[str, Any]
+) -> NotionClientExtended:
     try:
         client = NotionClientExtended(token_v2=token)
     except requests.exceptions.HTTPError as e:
         raise NotionError("Invalid Notion token") from e
 
-    client.options = options
+    client.options = {**options, "row_cache": row_cache}
 
     return client
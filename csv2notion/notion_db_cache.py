@@ -0,0 +1,97 @@
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, Sequence
+
+from csv2notion.utils_iter import chunks
+
+# SQLite default limit on variables per statement is 999
+KEYS_BATCH_SIZE = 500
+
+
+# row ids by key for each collection, kept between runs
+class RowCache(object):
+    def __init__(self, db_path: Path) -> None:
+        self._lock = threading.Lock()
+
+        # ids of new rows are written in one go on flush, not one commit per row
+        self._pending: Dict[str, Dict[str, str]] = {}
+
+        self._conn = sqlite3.connect(str(db_path), check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS row_ids ("
+            " collection_id TEXT NOT NULL,"
+            " key TEXT NOT NULL,"
+            " row_id TEXT NOT NULL,"
+            " PRIMARY KEY (collection_id, key))"
+        )
+        self._conn.commit()
+
+    def get_row_ids(self, collection_id: str, keys: Sequence[str]) -> Dict[str, str]:
+        row_ids: Dict[str, str] = {}
+
+        with self._lock:
+            for batch in chunks(list(dict.fromkeys(keys)), KEYS_BATCH_SIZE):
+                placeholders = ",".join("?" * len(batch))
+                query = self._conn.execute(
+                    "SELECT key, row_id FROM row_ids"  # noqa: S608
+                    f" WHERE collection_id = ? AND key IN ({placeholders})",
+                    [collection_id, *batch],
+                )
+                row_ids.update(query.fetchall())
+
+            pending = self._pending.get(collection_id, {})
+            for k in keys:
+                if k in pending:
+                    row_ids.setdefault(k, pending[k])
+
+        return row_ids
+
+    def update(self, collection_id: str, row_ids: Dict[str, str]) -> None:
+        # first row with the same key wins, same as in full load
+        with self._lock:
+            pending = self._pending.setdefault(collection_id, {})
+            for k, r_id in row_ids.items():
+                pending.setdefault(k, r_id)
+
+    def flush(self) -> None:
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO row_ids VALUES (?, ?, ?)",
+                (
+                    (collection_id, k, r_id)
+                    for collection_id, row_ids in self._pending.items()
+                    for k, r_id in row_ids.items()
+                ),
+            )
+            self._pending.clear()
+
+    def replace(self, collection_id: str, row_ids: Dict[str, str]) -> None:
+        with self._lock, self._conn:
+            self._pending.pop(collection_id, None)
+            self._conn.execute(
+                "DELETE FROM row_ids WHERE collection_id = ?", (collection_id,)
+            )
+            self._conn.executemany(
+                "INSERT INTO row_ids VALUES (?, ?, ?)",
+                ((collection_id, k, r_id) for k, r_id in row_ids.items()),
+            )
+
+    def remove(self, collection_id: str, keys: Iterable[str]) -> None:
+        keys = list(keys)
+
+        with self._lock, self._conn:
+            pending = self._pending.get(collection_id, {})
+            for k in keys:
+                pending.pop(k, None)
+
+            self._conn.executemany(
+                "DELETE FROM row_ids WHERE collection_id = ? AND key = ?",
+                ((collection_id, k) for k in keys),
+            )
+
+    def close(self) -> None:
+        self.flush()
+
+        with self._lock:
+            self._conn.close()
@@ -1,12 +1,87 @@
-from copy import deepcopy
-from typing import Any, Dict, Optional
+from collections import ChainMap, defaultdict
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    cast,
+)
 
 from notion.client import NotionClient, create_session
 from notion.space import Space
 from notion.store import RecordStore
 from notion.user import User
+from notion.utils import extract_id
 
 from csv2notion.notion_db_collection import CollectionExtended
+from csv2notion.notion_db_loads import RecordLoads, RecordValue
+from csv2notion.notion_db_schema import SchemaIndex
+from csv2notion.utils_iter import chunks
+
+RECORDS_BATCH_SIZE = 100
+
+
+# store replaces updated records with copies, so shared ones are never modified
+class _OverlayTable(ChainMap):  # type: ignore[type-arg]
+    def __init__(self, shared: Dict[str, Any], factory: Callable[[], Any]) -> None:
+        super().__init__({}, shared)
+        self._factory = factory
+        self._removed: Set[str] = set()
+
+    def __getitem__(self, key: str) -> Any:
+        local, shared = self.maps
+        if key in local:
+            return local[key]
+        if key in shared and key not in self._removed:
+            return shared[key]
+        return self.__missing__(key)
+
+    def __missing__(self, key: str) -> Any:
+        # same as defaultdict, but without touching shared records
+        value = self[key] = self._factory()
+        return value
+
+    def __contains__(self, key: object) -> bool:
+        local, shared = self.maps
+        return key in local or (key in shared and key not in self._removed)
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        self._removed.discard(key)
+        self.maps[0][key] = value
+
+    def __delitem__(self, key: str) -> None:
+        if key not in self:
+            raise KeyError(key)
+        self.maps[0].pop(key, None)
+        self._removed.add(key)
+
+    def __iter__(self) -> Iterator[str]:
+        local, shared = self.maps
+        # other threads can add shared records meanwhile, so iterate a snapshot
+        shared_keys = [k for k in list(shared) if k not in local]
+        return iter([*local, *(k for k in shared_keys if k not in self._removed)])
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+
+class _OverlayValues(dict):  # type: ignore[type-arg]
+    def __init__(self, shared: Dict[str, Any], factory: Callable[[], Any]) -> None:
+        super().__init__()
+        self._shared = shared
+        self._factory = factory
+
+    def __missing__(self, table: str) -> _OverlayTable:
+        # setdefault is atomic, so that owner of shared records
+        # and other threads get the same table
+        shared_table = self._shared.setdefault(table, defaultdict(self._factory))
+        overlay = self[table] = _OverlayTable(shared_table, self._factory)
+        return overlay
 
 
 class NotionClientExtended(NotionClient):
@@ -20,15 +95,19 @@ class NotionClientExtended(NotionClient):
         self.options = options or {}
 
         if old_client is None:
+            self.schema_indexes: Dict[str, Tuple[Any, SchemaIndex]] = {}
+            self.record_loads = RecordLoads()
             super().__init__(*args, **kwargs)
             return
 
         self._monitor = None
 
+        self.record_loads = old_client.record_loads
+
         self.session = create_session()
         self.session.cookies = old_client.session.cookies.copy()
 
-        self._store = self._clone_store(old_client)
+        self._store, self.schema_indexes = self._clone_store(old_client)
 
         self._clone_user_info(old_client)
 
@@ -42,15 +121,97 @@ class NotionClientExtended(NotionClient):
         )
         return CollectionExtended(self, collection_id) if coll else None
 
-    def _clone_store(self, old_client: NotionClient) -> RecordStore:
+    def get_record_data(
+        self, table: str, id: str, force_refresh: bool = False, limit: int = 100
+    ) -> Optional[Dict[str, Any]]:
+        record_id = extract_id(id)
+
+        if force_refresh or record_id not in self._store._values[table]:
+            self._load_records(
+                table,
+                [record_id],
+                lambda _: self._store.get(
+                    table, record_id, force_refresh=True, limit=limit
+                ),
+            )
+
+        return cast(Optional[Dict[str, Any]], self._store._values[table].get(record_id))
+
+    # collection record is replaced on every change, only then index is rebuilt
+    def get_schema_index(
+        self, collection_id: str, collection: Dict[str, Any]
+    ) -> SchemaIndex:
+        indexed_collection, schema_index = self.schema_indexes.get(
+            collection_id, (None, None)
+        )
+
+        if schema_index is None or indexed_collection is not collection:
+            schema_index = SchemaIndex(collection["schema"])
+            self.schema_indexes[collection_id] = (collection, schema_index)
+
+        return schema_index
+
+    # records that don't exist or are not accessible are returned as None
+    def get_records(
+        self, table: str, record_ids: Iterable[str], force_refresh: bool = False
+    ) -> Dict[str, Optional[Dict[str, Any]]]:
+        table_values = self._store._values[table]
+
+        record_ids = list(dict.fromkeys(record_ids))
+        missing_ids = [
+            r_id for r_id in record_ids if force_refresh or r_id not in table_values
+        ]
+
+        def fetch(ids: List[str]) -> None:
+            for batch in chunks(ids, RECORDS_BATCH_SIZE):
+                self.refresh_records(**{table: batch})
+
+        self._load_records(table, missing_ids, fetch)
+
+        return {r_id: table_values.get(r_id) for r_id in record_ids}
+
+    # records loaded by other threads at the same time are copied, not fetched
+    def _load_records(
+        self, table: str, record_ids: List[str], fetch: Callable[[List[str]], Any]
+    ) -> None:
+        if not record_ids:
+            return
+
+        def fetch_values(ids: List[str]) -> Dict[str, RecordValue]:
+            fetch(ids)
+            return {
+                r_id: (
+                    self._store._values[table].get(r_id),
+                    self._store._role[table].get(r_id),
+                )
+                for r_id in ids
+            }
+
+        records = self.record_loads.load(table, record_ids, fetch_values)
+
+        table_values = self._store._values[table]
+        for r_id, (value, role) in records.items():
+            if value is not None and table_values.get(r_id) is not value:
+                self._store._update_record(table, r_id, value=value, role=role)
+
+    # new store reads records of the old one, updates are kept in the new one only
+    def _clone_store(
+        self, old_client: "NotionClientExtended"
+    ) -> Tuple[RecordStore, Dict[str, Tuple[Any, SchemaIndex]]]:
         new_store = RecordStore(self)
         old_store = old_client._store
 
-        new_store._values = deepcopy(old_store._values)
-        new_store._role = deepcopy(old_store._role)
-        new_store._collection_row_ids = deepcopy(old_store._collection_row_ids)
-
-        return new_store
+        with old_store._mutex:
+            new_store._values = _OverlayValues(old_store._values, dict)
+            new_store._role = _OverlayValues(old_store._role, str)
+            new_store._collection_row_ids = {
+                c_id: list(row_ids)
+                for c_id, row_ids in old_store._collection_row_ids.items()
+            }
+
+        # collection records are the same objects until updated,
+        # so schema indexes stay valid for the new client
+        return new_store, old_client.schema_indexes.copy()
 
     def _clone_user_info(self, old_client: NotionClient) -> None:
         self.current_user = User(self, old_client.current_user.id)
@@ -1,30 +1,86 @@
 import random
-from typing import Any, Dict, List, Optional, Tuple, cast
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from copy import deepcopy
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    cast,
+)
 
-from notion.collection import Collection, NotionSelect
+from notion.collection import CalendarView, Collection, CollectionQuery, NotionSelect
+from notion.markdown import markdown_to_notion, notion_to_markdown
+from notion.operations import build_operation
+from notion.utils import now
 
+from csv2notion.notion_db_schema import SchemaIndex
 from csv2notion.notion_row import CollectionRowBlockExtended
 from csv2notion.utils_db import make_status_column
+from csv2notion.utils_iter import chunks
 from csv2notion.utils_rand_id import rand_id_unique
 
+ROWS_BATCH_SIZE = 50
+
+# titles per filtered query and max rows returned by each
+TITLE_QUERY_BATCH_SIZE = 50
+TITLE_QUERY_LIMIT = 1000
+
 
 class CollectionExtended(Collection):
-    def get_rows(self) -> List[CollectionRowBlockExtended]:  # noqa: WPS615
-        return [
-            CollectionRowBlockExtended(row._client, row._id)
-            for row in super().get_rows()
-        ]
+    def get_row(self, row_id: str) -> CollectionRowBlockExtended:
+        return CollectionRowBlockExtended(self._client, row_id)
+
+    def get_row_count(self) -> int:
+        query = CollectionQuery(self, self._get_a_collection_view())
+        return int(query._get_total_rows())
+
+    def get_rows_by_id(
+        self, row_ids: Iterable[str]
+    ) -> Dict[str, CollectionRowBlockExtended]:
+        records = self._client.get_records("block", row_ids)
+
+        return {
+            row_id: CollectionRowBlockExtended(self._client, row_id)
+            for row_id, record in records.items()
+            if record and self._is_own_row(record)
+        }
 
-    def get_unique_rows(self) -> Dict[str, CollectionRowBlockExtended]:
+    # only first row is kept if multiple have same title
+    def get_rows_by_title(
+        self, titles: Sequence[str]
+    ) -> Dict[str, CollectionRowBlockExtended]:
         rows: Dict[str, CollectionRowBlockExtended] = {}
+        cut_off_titles: List[str] = []
 
-        # sort rows so that only first row is kept if multiple have same title
-        sorted_rows = sorted(self.get_rows(), key=lambda r: str(r.title))
+        for batch in chunks(list(dict.fromkeys(titles)), TITLE_QUERY_BATCH_SIZE):
+            cut_off_titles.extend(self._find_rows_by_title(batch, rows))
+
+        if cut_off_titles:
+            # queries have no offset, so only full load can find the rest
+            all_row_ids, _ = self.get_unique_row_ids()
+            for title in cut_off_titles:
+                if title in all_row_ids:
+                    rows[title] = self.get_row(all_row_ids[title])
 
-        for row in sorted_rows:
-            rows.setdefault(row.title, row)
         return rows
 
+    # only first row is kept if multiple have same title, duplicates are reported
+    def get_unique_row_ids(self, limit: int = -1) -> Tuple[Dict[str, str], bool]:
+        row_ids: Dict[str, str] = {}
+        has_duplicates = False
+
+        for row_id in self.query(limit=limit)._block_ids:
+            if row_ids.setdefault(self._get_row_title(row_id), row_id) != row_id:
+                has_duplicates = True
+
+        return row_ids, has_duplicates
+
     def add_row_block(
         self,
         update_views: bool = True,
@@ -43,6 +99,38 @@ class CollectionExtended(Collection):
 
         return cast(CollectionRowBlockExtended, new_row)
 
+    @property
+    def schema_index(self) -> SchemaIndex:
+        return cast(SchemaIndex, self._client.get_schema_index(self.id, self.get()))
+
+    def get_schema_properties(self) -> List[Dict[str, Any]]:
+        return [prop.copy() for prop in self.schema_index.properties]
+
+    def get_schema_property(self, identifier: str) -> Optional[Dict[str, Any]]:
+        return self.schema_index.get_property(identifier)
+
+    def add_key_rows(
+        self, keys: Sequence[str], max_workers: int = 1
+    ) -> Dict[str, CollectionRowBlockExtended]:
+        row_ids = {key: str(uuid.uuid4()) for key in keys}
+        batches = chunks(list(row_ids.items()), ROWS_BATCH_SIZE)
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            list(executor.map(self._submit_key_rows, batches))
+
+        with self._client.as_atomic_transaction():
+            for view in self.parent.views:
+                if view is None or isinstance(view, CalendarView):
+                    continue
+                view.set(
+                    "page_sort", view.get("page_sort", []) + list(row_ids.values())
+                )
+
+        return {
+            key: CollectionRowBlockExtended(self._client, row_id)
+            for key, row_id in row_ids.items()
+        }
+
     def add_column(self, column_name: str, column_type: str) -> None:
         schema_raw = self.get("schema")
         new_id = rand_id_unique(4, schema_raw)
@@ -53,35 +141,158 @@ class CollectionExtended(Collection):
 
         self.set("schema", schema_raw)
 
-    def has_duplicates(self) -> bool:
-        row_titles = [row.title for row in self.get_rows()]
-        return len(row_titles) != len(set(row_titles))
+    # same as row.title, but read straight from record store
+    def _get_row_title(self, row_id: str) -> str:
+        record = self._client.get_record_data("block", row_id) or {}
+        title = record.get("properties", {}).get("title")
+        return str(notion_to_markdown(title or [[""]]))
+
+    # returns titles that are still cut off by query limit when queried alone
+    def _find_rows_by_title(
+        self, titles: List[str], rows: Dict[str, CollectionRowBlockExtended]
+    ) -> List[str]:
+        row_ids, has_more = self._query_title_ids(titles)
+
+        batch_titles = set(titles)
+        for row_id in row_ids:
+            row = self.get_row(row_id)
+            if row.title in batch_titles:
+                rows.setdefault(row.title, row)
+
+        missing_titles = [t for t in titles if t not in rows]
+        if not has_more or not missing_titles:
+            return []
+
+        if len(missing_titles) < len(titles):
+            return self._find_rows_by_title(missing_titles, rows)
 
-    def is_accessible(self) -> bool:
-        rec = self._client.get_record_data("collection", self.id, force_refresh=True)
-        return rec is not None
+        if len(titles) > 1:
+            middle = len(titles) // 2
+            return [
+                *self._find_rows_by_title(titles[:middle], rows),
+                *self._find_rows_by_title(titles[middle:], rows),
+            ]
 
-    def check_schema_select_options(  # noqa: WPS210
+        return titles
+
+    def _query_title_ids(self, titles: List[str]) -> Tuple[List[str], bool]:
+        title_filters = [
+            {
+                "property": "title",
+                "filter": {
+                    "operator": "string_is",
+                    "value": {"type": "exact", "value": title},
+                },
+            }
+            for title in titles
+        ]
+
+        space_id = self._client.current_space.id
+        data = {
+            "collection": {"id": self.id, "spaceId": space_id},
+            "collectionView": {
+                "id": self._get_a_collection_view().id,
+                "spaceId": space_id,
+            },
+            "loader": {
+                "reducers": {
+                    "collection_group_results": {
+                        "limit": TITLE_QUERY_LIMIT,
+                        "type": "results",
+                    },
+                },
+                "filter": {"operator": "or", "filters": title_filters},
+                "searchQuery": "",
+                "sort": [],
+                # title filters don't depend on time zone
+                "userTimeZone": "UTC",
+                "type": "reducer",
+            },
+        }
+
+        response = self._client.post("queryCollection", data).json()
+
+        self._client._store.store_recordmap(response["recordMap"])
+
+        group_results = response["result"]["reducerResults"]["collection_group_results"]
+        return list(group_results["blockIds"]), bool(group_results.get("hasMore"))
+
+    def _submit_key_rows(self, batch: List[Tuple[str, str]]) -> None:
+        operations = []
+
+        for key, row_id in batch:
+            operations += [
+                build_operation(id=row_id, path=[], args=self._new_row_record(row_id)),
+                build_operation(
+                    id=row_id,
+                    path=["properties", "title"],
+                    args=markdown_to_notion(key),
+                ),
+            ]
+
+        self._client.submit_transaction(operations)
+
+    def _new_row_record(self, row_id: str) -> Dict[str, Any]:
+        return {
+            "id": row_id,
+            "version": 1,
+            "alive": True,
+            "created_by_id": self._client.current_user.id,
+            "created_by_table": "notion_user",
+            "created_time": now(),
+            "parent_id": self.id,
+            "parent_table": "collection",
+            "space_id": self._client.current_space.id,
+            "type": "page",
+        }
+
+    def _is_own_row(self, record: Dict[str, Any]) -> bool:
+        return bool(
+            record.get("alive")
+            and not record.get("is_template")
+            and record.get("parent_table") == "collection"
+            and record.get("parent_id") == self.id
+        )
+
+    def add_select_options(
+        self, prop_values: Mapping[str, Iterable[str]]
+    ) -> Dict[str, List[str]]:
+        schema = deepcopy(self.get("schema"))
+        new_options: Dict[str, List[str]] = {}
+
+        for prop_id, values in prop_values.items():  # noqa: WPS110
+            prop_options = schema[prop_id].setdefault("options", [])
+            current_options = {p["value"].lower() for p in prop_options}
+
+            for v in values:
+                if v and v.lower() not in current_options:
+                    current_options.add(v.lower())
+                    prop_options.append(NotionSelect(v, self._select_color()).to_dict())
+                    new_options.setdefault(prop_id, []).append(v)
+
+        if new_options:
+            self.set("schema", schema)
+
+        return new_options
+
+    def check_schema_select_options(
         self, prop: Dict[str, Any], values: Any  # noqa: WPS110
     ) -> Tuple[bool, Dict[str, Any]]:
-        schema_update = False
-
-        prop_options = prop.setdefault("options", [])
-        current_options = [p["value"].lower() for p in prop_options]
         if not isinstance(values, list):
             values = [values]  # noqa: WPS110
 
-        for v in values:
-            if v and v.lower() not in current_options:
-                schema_update = True
+        prop_options = self.schema_index.add_options(
+            prop["id"], values, self._select_color
+        )
+        if prop_options is None:
+            return False, prop
 
-                if self._client.options.get("is_randomize_select_colors") is True:
-                    color = _get_random_select_color()
-                else:
-                    color = "default"
+        return True, {**prop, "options": prop_options}
 
-                prop_options.append(NotionSelect(v, color).to_dict())
-        return schema_update, prop
+    def _select_color(self) -> str:
+        if self._client.options.get("is_randomize_select_colors") is True:
+            return _get_random_select_color()
+        return "default"
 
 
 def _get_random_select_color() -> str:
@@ -0,0 +1,75 @@
+import logging
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+RecordKey = Tuple[str, str]
+RecordValue = Tuple[Optional[Dict[str, Any]], Optional[str]]
+RecordsFetcher = Callable[[List[str]], Dict[str, RecordValue]]
+
+
+# records being loaded by another thread are awaited instead of loaded again
+class RecordLoads(object):
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._in_flight: Dict[RecordKey, "Future[RecordValue]"] = {}
+
+        # records loaded by another thread and records fetched
+        self.hits = 0
+        self.misses = 0
+
+    # records are returned as (value, role) pairs
+    def load(
+        self, table: str, record_ids: List[str], fetch: RecordsFetcher
+    ) -> Dict[str, RecordValue]:
+        own: Dict[str, "Future[RecordValue]"] = {}
+        joined: Dict[str, "Future[RecordValue]"] = {}
+
+        with self._lock:
+            for r_id in record_ids:
+                key = (table, r_id)
+                if key in self._in_flight:
+                    joined[r_id] = self._in_flight[key]
+                    self.hits += 1
+                else:
+                    own[r_id] = self._in_flight[key] = Future()
+                    self.misses += 1
+
+        records = self._fetch_own(table, own, fetch)
+
+        records.update({r_id: future.result() for r_id, future in joined.items()})
+
+        return records
+
+    def log_stats(self) -> None:
+        logger.debug(
+            f"Records: {self.misses} fetched,"
+            f" {self.hits} shared with loads of other threads"
+        )
+
+    def _fetch_own(
+        self,
+        table: str,
+        own: Dict[str, "Future[RecordValue]"],
+        fetch: RecordsFetcher,
+    ) -> Dict[str, RecordValue]:
+        if not own:
+            return {}
+
+        try:
+            records = fetch(list(own))
+        except Exception as e:
+            for future in own.values():
+                future.set_exception(e)
+            raise
+        else:
+            for r_id, future in own.items():
+                future.set_result(records.get(r_id, (None, None)))
+        finally:
+            with self._lock:
+                for r_id in own:
+                    del self._in_flight[(table, r_id)]
+
+        return records
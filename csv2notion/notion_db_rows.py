@@ -0,0 +1,17 @@
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+
+
+# only row ids are kept, so that index can be shared by DBs of all threads
+@dataclass
+class RowIndex(object):
+    row_ids: Optional[Dict[str, str]] = None
+    has_duplicates: bool = False
+    row_count: Optional[int] = None
+    ids_by_id: Dict[str, Optional[str]] = field(default_factory=dict)
+    ids_by_key: Dict[str, Optional[str]] = field(default_factory=dict)
+    lock: threading.RLock = field(default_factory=threading.RLock, repr=False)
+
+
+RowIndexes = Dict[str, RowIndex]
@@ -0,0 +1,76 @@
+import threading
+from copy import deepcopy
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set
+
+from notion.collection import NotionSelect
+from notion.utils import slugify
+
+OPTION_TYPES = frozenset(("select", "multi_select", "status"))
+
+
+# shared between rows and threads, has to be dropped on every schema change
+class SchemaIndex(object):
+    def __init__(self, schema: Dict[str, Dict[str, Any]]) -> None:
+        self.properties: List[Dict[str, Any]] = [
+            {"id": p_id, "slug": slugify(p["name"]), **p}
+            for p_id, p in deepcopy(schema).items()
+        ]
+
+        self._by_id = {p["id"]: p for p in self.properties}
+        self._by_slug: Dict[str, Dict[str, Any]] = {}
+        for prop in self.properties:
+            self._by_slug.setdefault(prop["slug"], prop)
+
+        self._by_identifier: Dict[str, Optional[Dict[str, Any]]] = {}
+
+        self._option_values = {
+            p["id"]: {o["value"].lower() for o in p.get("options", [])}
+            for p in self.properties
+            if p["type"] in OPTION_TYPES
+        }
+        self._options_lock = threading.Lock()
+
+    @property
+    def key_column(self) -> str:
+        return str(next(p["name"] for p in self.properties if p["type"] == "title"))
+
+    def get_property(self, identifier: str) -> Optional[Dict[str, Any]]:
+        try:
+            return self._by_identifier[identifier]
+        except KeyError:
+            prop = self._find_property(identifier)
+            self._by_identifier[identifier] = prop
+            return prop
+
+    def option_values(self, prop_id: str) -> Set[str]:
+        return self._option_values.get(prop_id, set())
+
+    # returns full options list if any were added
+    def add_options(
+        self,
+        prop_id: str,
+        values: Iterable[str],  # noqa: WPS110
+        get_color: Callable[[], str],
+    ) -> Optional[List[Dict[str, Any]]]:
+        prop = self._by_id[prop_id]
+
+        with self._options_lock:
+            prop_options = prop.setdefault("options", [])
+            option_values = self._option_values.setdefault(prop_id, set())
+
+            is_updated = False
+            for v in values:
+                if v and v.lower() not in option_values:
+                    option_values.add(v.lower())
+                    prop_options.append(NotionSelect(v, get_color()).to_dict())
+                    is_updated = True
+
+            return list(prop_options) if is_updated else None
+
+    def _find_property(self, identifier: str) -> Optional[Dict[str, Any]]:
+        prop = self._by_id.get(identifier) or self._by_slug.get(slugify(identifier))
+
+        if prop is None and identifier == "title":
+            prop = next((p for p in self.properties if p["type"] == "title"), None)
+
+        return prop
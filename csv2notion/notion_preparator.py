@@ -1,10 +1,14 @@
 import logging
-from typing import Callable, Dict, Iterable, List, Set, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain
+from typing import Dict, Iterable, List, Set, Tuple
 
 from csv2notion.csv_data import CSVData
 from csv2notion.notion_db import NotionDB
 from csv2notion.utils_exceptions import NotionError
 from csv2notion.utils_static import UNSETTABLE_TYPES, ConversionRules
+from csv2notion.utils_str import split_str
+from csv2notion.utils_threading import Task, run_task_graph
 
 logger = logging.getLogger(__name__)
 
@@ -17,29 +21,49 @@ class NotionPreparator(object):  # noqa: WPS214
         self.csv = csv
         self.rules = conversion_rules
 
+    # steps that modify CSV data run one after another, others concurrently
     def prepare(self) -> None:
-        steps: List[Callable[[], None]] = [
+        csv_validations: List[Task] = [
             self._validate_image_column,
             self._validate_image_caption_column,
             self._validate_icon_column,
             self._validate_mandatory_columns,
-            self._handle_merge,
-            self._handle_missing_columns,
-            self._handle_unsupported_columns,
-            self._handle_inaccessible_relations,
-            self._handle_wrong_status_values,
         ]
 
+        steps: Dict[Task, List[Task]] = {
+            **{step: [] for step in csv_validations},
+            self._handle_merge: csv_validations,
+            self._handle_missing_columns: [self._handle_merge],
+            self._handle_unsupported_columns: [self._handle_missing_columns],
+            self._handle_inaccessible_relations: [self._handle_unsupported_columns],
+            self._handle_wrong_status_values: [self._handle_inaccessible_relations],
+        }
+
+        db_validations: List[Task] = []
+
         if self.rules.fail_on_relation_duplicates:
-            steps += [self._validate_relations_duplicates]
+            steps[self._validate_relations_duplicates] = [
+                self._handle_inaccessible_relations
+            ]
+            db_validations += [self._validate_relations_duplicates]
 
         if self.rules.fail_on_duplicates:
-            steps += [self._validate_csv_duplicates, self._validate_db_duplicates]
-
-        steps += [self._validate_columns_left]
+            steps[self._validate_csv_duplicates] = [self._handle_merge]
+            steps[self._validate_db_duplicates] = [self._handle_merge]
+            db_validations += [
+                self._validate_csv_duplicates,
+                self._validate_db_duplicates,
+            ]
+
+        steps[self._validate_columns_left] = [self._handle_wrong_status_values]
+
+        # DB schema is changed only after everything is validated
+        steps[self._handle_new_select_options] = [
+            self._validate_columns_left,
+            *db_validations,
+        ]
 
-        for step in steps:
-            step()
+        run_task_graph(steps, max_workers=self.rules.max_threads)
 
     def _validate_image_column(self) -> None:
         if self.rules.image_column is None:
@@ -123,9 +147,7 @@ class NotionPreparator(object):  # noqa: WPS214
             raise NotionError("Unsettable columns found")
 
     def _handle_inaccessible_relations(self) -> None:
-        inaccessible_relations = [
-            r_col for r_col, r in self.db.relations.items() if not r.is_accessible()
-        ]
+        inaccessible_relations = self.db.get_inaccessible_relations()
 
         if inaccessible_relations:
             warn_text = f"Columns with inaccessible relations: {inaccessible_relations}"
@@ -159,9 +181,36 @@ class NotionPreparator(object):  # noqa: WPS214
                 if row[s_column] in wrong_values:
                     row[s_column] = ""
 
+    def _handle_new_select_options(self) -> None:
+        column_values = {
+            col_key: self._get_select_values(col_key)
+            for col_key in self._present_columns()
+            if self.db.columns[col_key]["type"] in {"select", "multi_select"}
+        }
+
+        if not column_values:
+            return
+
+        new_options = self.db.add_select_options(column_values)
+
+        for col_key, col_options in new_options.items():
+            logger.info(f"Adding {len(col_options)} new options to '{col_key}' column")
+
     def _validate_relations_duplicates(self) -> None:
-        for relation_key, relation in self._present_relations().items():
-            if relation.has_duplicates():
+        relations = self._present_relations()
+
+        # linked DBs are loaded concurrently, each one only once
+        relation_dbs = {r.collection.id: r for r in relations.values()}
+        with ThreadPoolExecutor(max_workers=self.rules.max_threads) as executor:
+            has_duplicates = dict(
+                zip(
+                    relation_dbs,
+                    executor.map(NotionDB.has_duplicates, relation_dbs.values()),
+                )
+            )
+
+        for relation_key, relation in relations.items():
+            if has_duplicates[relation.collection.id]:
                 raise NotionError(
                     f"Collection DB '{relation.name}' used in '{relation_key}'"
                     f" relation column has duplicates which"
@@ -232,10 +281,18 @@ class NotionPreparator(object):  # noqa: WPS214
         return csv_columns - db_columns
 
     def _get_new_row_keys(self) -> Set[str]:
-        csv_keys = {v[self.csv.key_column] for v in self.csv}
-        db_keys = set(self.db.rows)
+        csv_keys = self.csv.col_values(self.csv.key_column)
+        db_keys = set(self.db.get_rows_by_key(csv_keys))
+
+        return set(csv_keys) - db_keys
+
+    def _get_select_values(self, column: str) -> List[str]:
+        col_values = dict.fromkeys(self.csv.col_values(column))
+
+        if self.db.columns[column]["type"] == "multi_select":
+            return list(dict.fromkeys(chain.from_iterable(map(split_str, col_values))))
 
-        return csv_keys - db_keys
+        return [v for v in col_values if v]
 
     def _get_wrong_status_values(self, column: str) -> Set[str]:
         col_values = set(self.csv.col_values(column))
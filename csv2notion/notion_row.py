@@ -172,9 +172,10 @@ class CollectionRowBlockExtended(CollectionRowBlock):  # noqa: WPS214
             if not raw_value:
                 result_value = [[""]]
             elif isinstance(raw_value, str):
-                valid_options = [p["value"].lower() for p in prop["options"]]
+                option_values = self.collection.schema_index.option_values(prop["id"])
 
-                if raw_value.lower() not in valid_options:
+                if raw_value.lower() not in option_values:
+                    valid_options = [p["value"].lower() for p in prop["options"]]
                     raise ValueError(
                         f"Value '{raw_value}' not acceptable for property"
                         f" '{identifier}' (valid options: {valid_options})"
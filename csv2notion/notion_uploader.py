@@ -1,5 +1,5 @@
 from dataclasses import dataclass
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 
 from csv2notion.notion_db import NotionDB
 from csv2notion.notion_row import CollectionRowBlockExtended
@@ -9,35 +9,32 @@ from csv2notion.notion_row import CollectionRowBlockExtended
 class NotionUploadRow(object):
     columns: Dict[str, Any]
     properties: Dict[str, Any]
-
-    def key(self) -> str:
-        return str(list(self.columns.values())[0])
+    row_id: Optional[str] = None
 
 
 class NotionRowUploader(object):
     def __init__(self, db: NotionDB):
         self.db = db
 
-    def upload_row(self, row: NotionUploadRow, is_merge: bool) -> None:
+    def upload_row(self, row: NotionUploadRow) -> None:
         post_properties = _extract_post_properties(row.properties)
 
-        db_row = self._get_db_row(row, is_merge)
+        db_row = self._get_db_row(row)
 
         # these need to be updated after
         # because they can't be updated in atomic transaction
         for prop, prop_val in post_properties.items():
             setattr(db_row, prop, prop_val)
 
-    def _get_db_row(
-        self, row: NotionUploadRow, is_merge: bool
-    ) -> CollectionRowBlockExtended:
-        existing_row = self.db.rows.get(row.key()) if is_merge else None
-
-        if is_merge and existing_row:
-            cur_row = existing_row
+    def _get_db_row(self, row: NotionUploadRow) -> CollectionRowBlockExtended:
+        # rows to merge with are looked up by key during conversion
+        if row.row_id is not None:
+            cur_row = CollectionRowBlockExtended(self.db.client, row.row_id)
             cur_row.update(properties=row.properties, columns=row.columns)
         else:
             cur_row = self.db.add_row(properties=row.properties, columns=row.columns)
+            # created row is addressed by id on later updates
+            row.row_id = cur_row.id
 
         return cur_row
 
@@ -1,5 +1,7 @@
 import hashlib
+import os
 from pathlib import Path
+from typing import Dict, FrozenSet
 
 
 def get_file_sha256(file_path: Path) -> str:
@@ -10,3 +12,35 @@ def get_file_sha256(file_path: Path) -> str:
         for chunk in iter(lambda: f.read(chunk_size), b""):  # noqa: WPS426
             hash_sha256.update(chunk)
     return hash_sha256.hexdigest()
+
+
+# each directory is listed only once, on first access
+class DirectoryIndex(object):
+    def __init__(self) -> None:
+        self._listings: Dict[Path, FrozenSet[str]] = {}
+
+    def exists(self, file_path: Path) -> bool:
+        if file_path.name in self._get_listing(file_path.parent):
+            return True
+
+        # listing might miss the file on case-insensitive file systems
+        return file_path.exists()
+
+    def _get_listing(self, dir_path: Path) -> FrozenSet[str]:
+        try:
+            return self._listings[dir_path]
+        except KeyError:
+            self._listings[dir_path] = _list_dir(dir_path)
+            return self._listings[dir_path]
+
+
+def _list_dir(dir_path: Path) -> FrozenSet[str]:
+    try:
+        with os.scandir(dir_path) as entries:
+            return frozenset(
+                entry.name
+                for entry in entries
+                if not entry.is_symlink() or os.path.exists(entry.path)
+            )
+    except OSError:
+        return frozenset()
@@ -0,0 +1,8 @@
+from typing import Iterator, List, Sequence, TypeVar
+
+T = TypeVar("T")
+
+
+def chunks(lst: Sequence[T], chunk_size: int) -> Iterator[List[T]]:
+    for i in range(0, len(lst), chunk_size):
+        yield list(lst[i : i + chunk_size])  # noqa: E203
@@ -35,6 +35,9 @@ FileType = Union[str, Path]
 class ConversionRules(object):
     csv_file: Path
 
+    max_threads: int
+    max_processes: int
+
     image_column: Optional[str]
     image_column_keep: bool
     image_column_mode: str
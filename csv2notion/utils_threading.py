@@ -1,25 +1,32 @@
 import threading
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import Any, Callable, Iterable, Iterator
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Future,
+    ThreadPoolExecutor,
+    as_completed,
+    wait,
+)
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Set
 
 from csv2notion.notion_db import NotionDB
 from csv2notion.notion_db_client import NotionClientExtended
 from csv2notion.notion_uploader import NotionRowUploader
 
+Task = Callable[[], None]
+
 
 class ThreadRowUploader(object):
-    def __init__(self, client: NotionClientExtended, collection_id: str) -> None:
+    def __init__(self, db: NotionDB) -> None:
         self.thread_data = threading.local()
 
-        self.client = client
-        self.collection_id = collection_id
+        self.db = db
 
     def worker(self, *args: Any, **kwargs: Any) -> None:
         try:
             notion_uploader = self.thread_data.uploader
         except AttributeError:
-            client = NotionClientExtended(old_client=self.client)
-            notion_db = NotionDB(client, self.collection_id)
+            client = NotionClientExtended(old_client=self.db.client)
+            notion_db = self.db.for_client(client)
             notion_uploader = NotionRowUploader(notion_db)
             self.thread_data.uploader = notion_uploader
 
@@ -31,8 +38,60 @@ def process_iter(
 ) -> Iterator[None]:
     if max_workers == 1:
         yield from map(worker, tasks)
-    else:
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            futures = [executor.submit(worker, t) for t in tasks]
+        return
+
+    # bounded number of pending tasks, so that tasks can be produced lazily
+    max_pending = max_workers * 2
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures: Set["Future[None]"] = set()
+
+        for t in tasks:
+            if len(futures) >= max_pending:
+                done, futures = wait(futures, return_when=FIRST_COMPLETED)
+                yield from (f.result() for f in done)
+
+            futures.add(executor.submit(worker, t))
+
+        yield from (f.result() for f in as_completed(futures))
+
+
+def run_task_graph(tasks: Dict[Task, List[Task]], max_workers: int) -> None:
+    # after a failure only tasks listed before it are started and the first
+    # failed one is raised, so the error doesn't depend on timing
+    task_order: Dict[Task, int] = {task: i for i, task in enumerate(tasks)}
+    pending = list(task_order)
+    done: Set[Task] = set()
+    failed: Dict[Task, Exception] = {}
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        running: Dict["Future[None]", Task] = {}
+
+        while pending or running:
+            first_failed = min((task_order[t] for t in failed), default=len(task_order))
+            ready = [
+                t
+                for t in pending
+                if task_order[t] < first_failed and done.issuperset(tasks[t])
+            ]
+            for task in ready:
+                pending.remove(task)
+                running[executor.submit(task)] = task
+
+            if not running:
+                if not failed:
+                    raise ValueError("Tasks have unresolvable dependencies")
+                break
+
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                task = running.pop(future)
+                try:
+                    future.result()
+                except Exception as e:
+                    failed[task] = e
+                else:
+                    done.add(task)
 
-            yield from (f.result() for f in as_completed(futures))
+    if failed:
+        raise failed[min(failed, key=lambda task: task_order[task])]
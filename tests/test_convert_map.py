@@ -0,0 +1,125 @@
+import subprocess
+import sys
+import warnings
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pytest
+
+from csv2notion.notion_convert_map import map_date, map_icon, map_notion_date
+from csv2notion.notion_convert_pool import map_columns_parallel
+from csv2notion.notion_convert_vector import (
+    get_vector_map,
+    map_checkbox_column,
+    map_number_column,
+)
+from csv2notion.utils_exceptions import TypeConversionError
+
+needs_numpy = pytest.mark.skipif(not get_vector_map(), reason="numpy not installed")
+
+
+@pytest.mark.parametrize(
+    "value,result",
+    [
+        ("2001-12-01", datetime(2001, 12, 1)),
+        ("2001-12-01T10:30", datetime(2001, 12, 1, 10, 30)),
+        ("2001-12-01 10:30:00Z", datetime(2001, 12, 1, 10, 30, tzinfo=timezone.utc)),
+        (
+            "2001-12-01T10:30:00+03:00",
+            datetime(2001, 12, 1, 10, 30, tzinfo=timezone(timedelta(hours=3))),
+        ),
+        ("12/01/2001", datetime(2001, 12, 1)),
+        ("Dec 1 2001 10:30", datetime(2001, 12, 1, 10, 30)),
+    ],
+)
+def test_map_date(value, result):
+    assert map_date(value) == result
+
+
+@pytest.mark.parametrize("value", ["bad", "2022-W01-1", "2022-001"])
+def test_map_date_bad(value):
+    with pytest.raises(TypeConversionError):
+        map_date(value)
+
+
+def test_map_date_memoised():
+    assert map_date("2001-12-02") is map_date("2001-12-02")
+
+
+def test_map_notion_date_range():
+    notion_date = map_notion_date("2001-12-01, 12/05/2001")
+
+    assert notion_date.start == datetime(2001, 12, 1)
+    assert notion_date.end == datetime(2001, 12, 5)
+
+
+def test_map_notion_date_not_shared():
+    assert map_notion_date("2001-12-01") is not map_notion_date("2001-12-01")
+
+
+@needs_numpy
+@pytest.mark.parametrize(
+    "values,result",
+    [
+        (["1", "2.5", " 3 ", "-1e3"], [1, 2.5, 3, -1000]),
+        (["1", "", "abc", "1"], [1, None, None, 1]),
+        (["", ""], [None, None]),
+    ],
+)
+def test_map_number_column(values, result):
+    converted = map_number_column(values)
+
+    assert converted == result
+    assert [type(v) for v in converted] == [type(v) for v in result]
+
+
+@needs_numpy
+def test_map_number_column_nan_no_warning():
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        converted = map_number_column(["nan", "inf", "1"])
+
+    assert converted[1:] == [float("inf"), 1]
+    assert converted[0] != converted[0]
+
+
+def test_numpy_imported_lazily():
+    code = (
+        "import sys, csv2notion.notion_convert_vector;" " print('numpy' in sys.modules)"
+    )
+    output = subprocess.check_output([sys.executable, "-c", code], text=True)
+
+    assert output.strip() == "False"
+
+
+@needs_numpy
+def test_map_checkbox_column():
+    assert map_checkbox_column(["true", "false", ""]) == [True, False, False]
+
+
+def test_map_columns_parallel():
+    converted = map_columns_parallel(
+        {
+            "a": ("number", ["1", "1", "bad"]),
+            "b": ("created_time", ["2001-12-01"]),
+        },
+        max_workers=2,
+    )
+
+    assert converted["a"]["1"] == 1
+    assert isinstance(converted["a"]["bad"], TypeConversionError)
+    assert converted["b"] == {"2001-12-01": datetime(2001, 12, 1)}
+
+
+@pytest.mark.parametrize(
+    "value,result",
+    [
+        ("😀", "😀"),
+        ("😀😀", Path("😀😀")),
+        ("a😀", Path("a😀")),
+        ("https://example.com/icon.png", "https://example.com/icon.png"),
+        ("icon.png", Path("icon.png")),
+    ],
+)
+def test_map_icon(value, result):
+    assert map_icon(value) == result
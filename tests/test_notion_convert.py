@@ -0,0 +1,210 @@
+import pytest
+
+from csv2notion.cli_args import parse_args
+from csv2notion.csv_data import CSVData
+from csv2notion.notion_convert import NotionRowConverter
+from csv2notion.utils_exceptions import NotionError
+from csv2notion.utils_static import ConversionRules
+
+
+def _mock_self_relation_db(mocker, db_keys=()):
+    test_db = mocker.Mock()
+    test_db.collection.id = "self_id"
+    test_db.columns = {
+        "a": {"type": "title"},
+        "b": {"type": "relation", "collection_id": "self_id"},
+    }
+
+    # rows created by upload are added to the shared row index
+    test_db_rows = {k: mocker.Mock(id=f"{k}_id") for k in db_keys}
+    test_db.get_rows_by_key.side_effect = lambda keys: {
+        k: test_db_rows[k] for k in keys if k in test_db_rows
+    }
+    test_db.collection.get_row.side_effect = lambda r_id: mocker.Mock(id=r_id)
+    test_db.relations = {"b": test_db}
+
+    return test_db, test_db_rows
+
+
+def _upload(notion_rows):
+    for notion_row in notion_rows:
+        if notion_row.row_id is None:
+            notion_row.row_id = f"{notion_row.columns['a']}_new"
+
+
+def test_self_relation_deferred(tmp_path, mocker):
+    test_file = tmp_path / "test.csv"
+    test_file.write_text("a,b\na1,a2\na2,\na3,a1")
+
+    test_rules = ConversionRules.from_args(parse_args(["--token", "x", str(test_file)]))
+
+    test_db, _ = _mock_self_relation_db(mocker)
+
+    converter = NotionRowConverter(test_db, test_rules)
+
+    notion_rows = converter.convert_to_notion_rows(CSVData(test_file))
+
+    assert [r.columns for r in notion_rows] == [{"a": "a1"}, {"a": "a2"}, {"a": "a3"}]
+    assert converter.has_deferred_rows
+
+    _upload(notion_rows)
+    deferred_rows = list(converter.iter_deferred_rows())
+
+    test_db.get_rows_by_key.assert_not_called()
+    assert [r.row_id for r in deferred_rows] == ["a1_new", "a3_new"]
+    assert [[row.id for row in r.columns["b"]] for r in deferred_rows] == [
+        ["a2_new"],
+        ["a1_new"],
+    ]
+
+
+def test_self_relation_prefers_created_row(tmp_path, mocker):
+    test_file = tmp_path / "test.csv"
+    test_file.write_text("a,b\na1,a2\na2,")
+
+    test_rules = ConversionRules.from_args(parse_args(["--token", "x", str(test_file)]))
+
+    test_db, _ = _mock_self_relation_db(mocker, ("a2",))
+
+    converter = NotionRowConverter(test_db, test_rules)
+
+    notion_rows = converter.convert_to_notion_rows(CSVData(test_file))
+    _upload(notion_rows)
+    deferred_rows = list(converter.iter_deferred_rows())
+
+    assert [[row.id for row in r.columns["b"]] for r in deferred_rows] == [["a2_new"]]
+
+
+def test_self_relation_errors_before_upload(tmp_path, mocker):
+    test_file = tmp_path / "test.csv"
+    test_file.write_text("a,b\na1,a2\na2,a1\na3,nope")
+
+    test_rules = ConversionRules.from_args(
+        parse_args(["--token", "x", "--fail-on-conversion-error", str(test_file)])
+    )
+
+    test_db, _ = _mock_self_relation_db(mocker)
+
+    converter = NotionRowConverter(test_db, test_rules)
+
+    with pytest.raises(NotionError, match=r"CSV \[4\]: Error during conversion."):
+        converter.convert_to_notion_rows(CSVData(test_file))
+
+
+def test_self_relation_merge_empty_cleared(tmp_path, mocker):
+    test_file = tmp_path / "test.csv"
+    test_file.write_text("a,b\na1,\na2,a1")
+
+    test_rules = ConversionRules.from_args(
+        parse_args(["--token", "x", "--merge", str(test_file)])
+    )
+
+    test_db, test_db_rows = _mock_self_relation_db(mocker, ("a1",))
+
+    converter = NotionRowConverter(test_db, test_rules)
+
+    notion_rows = converter.convert_to_notion_rows(CSVData(test_file))
+    _upload(notion_rows)
+    deferred_rows = list(converter.iter_deferred_rows())
+
+    assert [r.row_id for r in deferred_rows] == ["a1_id", "a2_new"]
+    assert [r.columns for r in deferred_rows] == [
+        {"b": []},
+        {"b": [test_db_rows["a1"]]},
+    ]
+
+
+def test_self_relation_missing_row_reported(tmp_path, mocker, caplog):
+    test_file = tmp_path / "test.csv"
+    test_file.write_text("a,b\na1,a2\na2,")
+
+    test_rules = ConversionRules.from_args(parse_args(["--token", "x", str(test_file)]))
+
+    test_db, _ = _mock_self_relation_db(mocker, ("a2",))
+
+    converter = NotionRowConverter(test_db, test_rules)
+    converter.convert_to_notion_rows(CSVData(test_file))
+
+    deferred_rows = list(converter.iter_deferred_rows())
+
+    assert deferred_rows == []
+    assert "CSV [2]: Row 'a1' was not created during upload." in caplog.text
+
+
+def test_merge_rows_looked_up_once(tmp_path, mocker):
+    test_file = tmp_path / "test.csv"
+    test_file.write_text("a,b\na1,1\na2,2")
+
+    test_rules = ConversionRules.from_args(
+        parse_args(["--token", "x", "--merge", str(test_file)])
+    )
+
+    test_db = mocker.Mock()
+    test_db.columns = {"a": {"type": "title"}, "b": {"type": "text"}}
+    test_db.relations = {}
+    test_db.get_rows_by_key.return_value = {"a2": mocker.Mock(id="a2_id")}
+
+    converter = NotionRowConverter(test_db, test_rules)
+
+    notion_rows = converter.convert_to_notion_rows(CSVData(test_file))
+
+    test_db.get_rows_by_key.assert_called_once_with(["a1", "a2"])
+    assert [r.row_id for r in notion_rows] == [None, "a2_id"]
+
+
+def test_merge_repeated_new_key_updates_created_row(tmp_path, mocker):
+    test_file = tmp_path / "test.csv"
+    test_file.write_text("a,b\na1,1\na2,2\na1,3")
+
+    test_rules = ConversionRules.from_args(
+        parse_args(["--token", "x", "--merge", str(test_file)])
+    )
+
+    test_db = mocker.Mock()
+    test_db.columns = {"a": {"type": "title"}, "b": {"type": "text"}}
+    test_db.relations = {}
+    test_db.get_rows_by_key.return_value = {}
+
+    converter = NotionRowConverter(test_db, test_rules)
+
+    notion_rows = converter.convert_to_notion_rows(CSVData(test_file))
+
+    assert [r.columns for r in notion_rows] == [
+        {"a": "a1", "b": "1"},
+        {"a": "a2", "b": "2"},
+    ]
+    assert converter.count_notion_rows(CSVData(test_file)) == len(notion_rows)
+
+    _upload(notion_rows)
+    deferred_rows = list(converter.iter_deferred_rows())
+
+    assert [r.row_id for r in deferred_rows] == ["a1_new"]
+    assert [r.columns for r in deferred_rows] == [{"a": "a1", "b": "3"}]
+
+
+def test_relation_rows_prefetched(tmp_path, mocker):
+    test_file = tmp_path / "test.csv"
+    test_file.write_text("a,b,c\na1,b1,c1\na2,b2,c1")
+
+    test_rules = ConversionRules.from_args(parse_args(["--token", "x", str(test_file)]))
+
+    test_db = mocker.Mock()
+    test_db.collection.id = "self_id"
+    test_db.columns = {
+        "a": {"type": "title"},
+        "b": {"type": "relation", "collection_id": "b_id"},
+        "c": {"type": "relation", "collection_id": "c_id"},
+    }
+    test_db.relations = {"b": mocker.Mock(), "c": mocker.Mock()}
+    for r_key, relation in test_db.relations.items():
+        relation.collection.id = f"{r_key}_id"
+        relation.get_rows_by_key.side_effect = lambda keys: {
+            k: mocker.Mock(id=f"{k}_id") for k in keys
+        }
+
+    converter = NotionRowConverter(test_db, test_rules)
+    converter.convert_to_notion_rows(CSVData(test_file))
+
+    test_db.relations["b"].get_rows_by_key.assert_any_call(["b1", "b2"])
+    test_db.relations["c"].get_rows_by_key.assert_any_call(["c1"])
+    test_db.relations["b"].get_rows_by_id.assert_called_once_with([])
@@ -0,0 +1,233 @@
+from csv2notion.notion_db import NotionDB
+from csv2notion.notion_db_cache import RowCache
+from csv2notion.notion_db_collection import CollectionExtended
+
+
+def _mock_db(mocker, row_count, row_ids, row_cache=None):
+    test_collection = mocker.patch("csv2notion.notion_db.CollectionExtended")
+    test_collection.return_value.id = "collection_id"
+
+    test_db = NotionDB(mocker.Mock(options={"row_cache": row_cache}), "collection_id")
+    test_db.collection.get_row_count.return_value = row_count
+    test_db.collection.get_unique_row_ids.return_value = (
+        {r_id: r_id for r_id in row_ids},
+        False,
+    )
+    test_db.collection.get_row.side_effect = lambda r_id: mocker.Mock(id=r_id)
+    test_db.collection.get_rows_by_id.side_effect = lambda ids: {
+        r_id: mocker.Mock(id=r_id) for r_id in ids if r_id in row_ids
+    }
+    test_db.collection.get_rows_by_title.side_effect = lambda keys: {
+        key: mocker.Mock(id=key, title=key) for key in keys if key in row_ids
+    }
+
+    return test_db
+
+
+def test_get_rows_by_id_small_db(mocker):
+    test_db = _mock_db(mocker, 2, ["a", "b"])
+
+    rows = test_db.get_rows_by_id(["a", "c"])
+
+    assert set(rows) == {"a"}
+    test_db.collection.get_unique_row_ids.assert_called_once_with(limit=2)
+    test_db.collection.get_rows_by_id.assert_not_called()
+
+
+def test_get_rows_by_id_big_db(mocker):
+    test_db = _mock_db(mocker, 1000, ["a", "b"])
+
+    rows = test_db.get_rows_by_id(["a", "c"])
+    rows_cached = test_db.get_rows_by_id(["a", "c"])
+
+    assert set(rows) == set(rows_cached) == {"a"}
+    test_db.collection.get_unique_row_ids.assert_not_called()
+    test_db.collection.get_rows_by_id.assert_called_once_with(["a", "c"])
+
+
+def test_get_rows_by_key_small_db(mocker):
+    test_db = _mock_db(mocker, 2, ["a", "b"])
+
+    rows = test_db.get_rows_by_key(["a", "c"])
+
+    assert set(rows) == {"a"}
+    test_db.collection.get_rows_by_title.assert_not_called()
+
+
+def test_get_rows_by_key_big_db(mocker):
+    test_db = _mock_db(mocker, 1000, ["a", "b"])
+
+    rows = test_db.get_rows_by_key(["a", "c"])
+    rows_cached = test_db.get_rows_by_key(["c", "a"])
+
+    assert set(rows) == set(rows_cached) == {"a"}
+    test_db.collection.get_unique_row_ids.assert_not_called()
+    test_db.collection.get_rows_by_title.assert_called_once_with(["a", "c"])
+
+
+def test_has_duplicates_shares_full_load(mocker):
+    test_db = _mock_db(mocker, 2, ["a", "b"])
+
+    assert not test_db.has_duplicates()
+    assert set(test_db.get_rows_by_key(["a", "c"])) == {"a"}
+    test_db.collection.get_unique_row_ids.assert_called_once_with(limit=-1)
+
+
+def test_row_index_shared_between_clients(mocker):
+    test_db = _mock_db(mocker, 2, ["a", "b"])
+    thread_db = test_db.for_client(mocker.Mock(options={}))
+
+    assert set(test_db.get_rows_by_key(["a"])) == {"a"}
+    assert set(thread_db.get_rows_by_key(["a", "b"])) == {"a", "b"}
+    assert thread_db.client is not test_db.client
+    test_db.collection.get_unique_row_ids.assert_called_once()
+
+
+def test_get_rows_by_key_row_cache(mocker, tmp_path):
+    row_cache = RowCache(tmp_path / "rows.db")
+    row_cache.update("collection_id", {"a": "a", "b": "b", "c": "c"})
+
+    test_db = _mock_db(mocker, 1000, ["a", "b"], row_cache)
+    test_db.collection.get_rows_by_id.side_effect = lambda ids: {
+        "a": mocker.Mock(id="a", title="a"),
+        "b": mocker.Mock(id="b", title="renamed"),
+    }
+
+    rows = test_db.get_rows_by_key(["a", "b", "c"])
+
+    assert set(rows) == {"a", "b"}
+    test_db.collection.get_rows_by_title.assert_called_once_with(["b", "c"])
+    assert row_cache.get_row_ids("collection_id", ["a", "b", "c"]) == {
+        "a": "a",
+        "b": "b",
+    }
+
+
+def test_get_rows_by_key_row_cache_skips_full_load(mocker, tmp_path):
+    row_cache = RowCache(tmp_path / "rows.db")
+    row_cache.update("collection_id", {"a": "a", "b": "b"})
+
+    test_db = _mock_db(mocker, 100, ["a", "b"], row_cache)
+    test_db.collection.get_rows_by_id.side_effect = lambda ids: {
+        r_id: mocker.Mock(id=r_id, title=r_id) for r_id in ids
+    }
+
+    rows = test_db.get_rows_by_key(["a", "b"])
+
+    assert set(rows) == {"a", "b"}
+    test_db.collection.get_rows_by_id.assert_called_once_with(["a", "b"])
+    test_db.collection.get_unique_row_ids.assert_not_called()
+    test_db.collection.get_rows_by_title.assert_not_called()
+
+
+def test_find_user_missing_cached(mocker):
+    mocker.patch("csv2notion.notion_db.CollectionExtended")
+
+    test_client = mocker.Mock()
+    test_client.post.return_value.json.return_value = {}
+
+    test_db = NotionDB(test_client, "collection_id")
+
+    assert test_db.find_user("missing@mail.com") is None
+    assert test_db.find_user("missing@mail.com") is None
+    test_client.post.assert_called_once()
+
+
+def test_get_user_by_name_first_match(mocker):
+    mocker.patch("csv2notion.notion_db.CollectionExtended")
+
+    test_users = [mocker.Mock(email="a@mail.com"), mocker.Mock(email="b@mail.com")]
+    for test_user in test_users:
+        test_user.name = "a"
+
+    test_client = mocker.Mock()
+    test_client.current_space.users = test_users
+
+    test_db = NotionDB(test_client, "collection_id")
+
+    assert test_db.get_user_by_name("a") is test_users[0]
+    assert test_db.get_user_by_name("b") is None
+
+
+def test_add_select_options_single_update(mocker):
+    test_collection = CollectionExtended(mocker.Mock(options={}), "0" * 32)
+
+    mocker.patch.object(
+        test_collection, "get", return_value={"b": {"options": [{"value": "B1"}]}}
+    )
+    mocker.patch.object(test_collection, "set")
+
+    new_options = test_collection.add_select_options({"b": ["b1", "b2", "B2", "b3"]})
+
+    assert new_options == {"b": ["b2", "b3"]}
+    test_collection.set.assert_called_once()
+
+
+def test_get_unique_row_ids_keeps_first(mocker):
+    test_client = mocker.Mock(options={})
+    test_client.get_record_data.side_effect = lambda _, r_id: {
+        "properties": {"title": [["b" if r_id == "3" else "a"]]}
+    }
+    test_collection = CollectionExtended(test_client, "0" * 32)
+
+    test_query = mocker.patch.object(test_collection, "query")
+    test_query.return_value._block_ids = ["1", "2", "3"]
+
+    assert test_collection.get_unique_row_ids() == ({"a": "1", "b": "3"}, True)
+
+
+# each query returns row ids (same as titles) and whether there is more
+def _mock_title_queries(mocker, test_collection, results):
+    test_collection.get_row = lambda r_id: mocker.Mock(id=r_id, title=r_id)
+    return mocker.patch.object(test_collection, "_query_title_ids", side_effect=results)
+
+
+def test_get_rows_by_title_requery_cut_off(mocker):
+    test_collection = CollectionExtended(mocker.Mock(options={}), "0" * 32)
+    test_query = _mock_title_queries(
+        mocker, test_collection, [(["a", "a"], True), (["b"], False)]
+    )
+
+    rows = test_collection.get_rows_by_title(["a", "b", "c"])
+
+    assert set(rows) == {"a", "b"}
+    assert [c.args[0] for c in test_query.call_args_list] == [
+        ["a", "b", "c"],
+        ["b", "c"],
+    ]
+
+
+def test_get_rows_by_title_split_without_progress(mocker):
+    test_collection = CollectionExtended(mocker.Mock(options={}), "0" * 32)
+    test_query = _mock_title_queries(
+        mocker,
+        test_collection,
+        [(["x"], True), (["a"], False), (["x"], True)],
+    )
+    mocker.patch.object(
+        test_collection, "get_unique_row_ids", return_value=({"b": "b"}, False)
+    )
+
+    rows = test_collection.get_rows_by_title(["a", "b"])
+
+    assert set(rows) == {"a", "b"}
+    assert [c.args[0] for c in test_query.call_args_list] == [["a", "b"], ["a"], ["b"]]
+
+
+def test_get_rows_by_title_single_full_load(mocker):
+    test_collection = CollectionExtended(mocker.Mock(options={}), "0" * 32)
+    _mock_title_queries(
+        mocker,
+        test_collection,
+        [(["x"], True), (["x"], True), (["x"], True)],
+    )
+    test_load = mocker.patch.object(
+        test_collection,
+        "get_unique_row_ids",
+        return_value=({"a": "a", "b": "b"}, False),
+    )
+
+    rows = test_collection.get_rows_by_title(["a", "b"])
+
+    assert set(rows) == {"a", "b"}
+    test_load.assert_called_once_with()
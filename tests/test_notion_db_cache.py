@@ -0,0 +1,45 @@
+from csv2notion.notion_db_cache import RowCache
+
+
+def test_row_cache_persists(tmp_path):
+    row_cache = RowCache(tmp_path / "rows.db")
+    row_cache.update("c1", {"a": "1", "b": "2"})
+    row_cache.update("c2", {"a": "3"})
+    row_cache.close()
+
+    row_cache = RowCache(tmp_path / "rows.db")
+
+    assert row_cache.get_row_ids("c1", ["a", "b", "c"]) == {"a": "1", "b": "2"}
+    assert row_cache.get_row_ids("c2", ["a", "b"]) == {"a": "3"}
+
+
+def test_row_cache_replace_remove(tmp_path):
+    row_cache = RowCache(tmp_path / "rows.db")
+    row_cache.update("c1", {"a": "1", "b": "2"})
+
+    row_cache.replace("c1", {"b": "4", "c": "5"})
+    row_cache.remove("c1", ["c"])
+
+    assert row_cache.get_row_ids("c1", ["a", "b", "c"]) == {"b": "4"}
+
+
+def test_row_cache_writes_on_flush(tmp_path):
+    row_cache = RowCache(tmp_path / "rows.db")
+    row_cache.update("c1", {"a": "1"})
+
+    assert row_cache.get_row_ids("c1", ["a"]) == {"a": "1"}
+    assert RowCache(tmp_path / "rows.db").get_row_ids("c1", ["a"]) == {}
+
+    row_cache.flush()
+
+    assert RowCache(tmp_path / "rows.db").get_row_ids("c1", ["a"]) == {"a": "1"}
+
+
+def test_row_cache_keeps_first_row(tmp_path):
+    row_cache = RowCache(tmp_path / "rows.db")
+    row_cache.update("c1", {"a": "1"})
+    row_cache.update("c1", {"a": "2", "b": "3"})
+    row_cache.flush()
+    row_cache.update("c1", {"b": "4"})
+
+    assert row_cache.get_row_ids("c1", ["a", "b"]) == {"a": "1", "b": "3"}
@@ -0,0 +1,66 @@
+from notion.store import RecordStore
+
+from csv2notion.notion_db_client import NotionClientExtended
+
+
+def _clone_store(mocker, old_store):
+    old_client = mocker.Mock(_store=old_store, schema_indexes={})
+    new_client = NotionClientExtended.__new__(NotionClientExtended)
+
+    new_store, _ = new_client._clone_store(old_client)
+
+    return new_store
+
+
+def test_clone_store_shares_records(mocker):
+    old_store = RecordStore(None)
+    old_store._update_record("block", "a", value={"id": "a", "title": "A"})
+
+    new_store = _clone_store(mocker, old_store)
+
+    assert new_store._get("block", "a") is old_store._get("block", "a")
+
+    old_store._update_record("block", "b", value={"id": "b"})
+
+    assert new_store._get("block", "b") == {"id": "b"}
+
+
+def test_clone_store_updates_are_local(mocker):
+    old_store = RecordStore(None)
+    old_store._update_record("block", "a", value={"id": "a", "title": "A"})
+
+    new_store = _clone_store(mocker, old_store)
+    new_store.run_local_operation("block", "a", ["title"], "set", "B")
+    new_store._update_record("block", "c", value={"id": "c"}, role="editor")
+
+    assert new_store._get("block", "a")["title"] == "B"
+    assert old_store._get("block", "a")["title"] == "A"
+    assert "c" not in old_store._values["block"]
+    assert "c" not in old_store._role["block"]
+
+
+def test_clone_store_remove_record(mocker):
+    old_store = RecordStore(None)
+    old_store._update_record("block", "a", value={"id": "a"})
+
+    new_store = _clone_store(mocker, old_store)
+    del new_store._values["block"]["a"]
+
+    assert "a" not in new_store._values["block"]
+    assert "a" in old_store._values["block"]
+
+
+def test_clone_store_iterates_snapshot(mocker):
+    old_store = RecordStore(None)
+    old_store._update_record("block", "a", value={"id": "a"})
+    old_store._update_record("block", "b", value={"id": "b"})
+
+    new_store = _clone_store(mocker, old_store)
+    new_store._update_record("block", "c", value={"id": "c"})
+    del new_store._values["block"]["a"]
+
+    for r_id in new_store._values["block"]:
+        old_store._update_record("block", f"{r_id}2", value={"id": f"{r_id}2"})
+
+    assert sorted(new_store._values["block"]) == ["b", "b2", "c", "c2"]
+    assert len(new_store._values["block"]) == 4
@@ -0,0 +1,60 @@
+import threading
+import time
+
+import pytest
+
+from csv2notion.notion_db_loads import RecordLoads
+
+
+def test_record_loads_coalesced():
+    loads = RecordLoads()
+    fetch_started = threading.Event()
+    fetch_release = threading.Event()
+    fetched = []
+
+    def slow_fetch(ids):
+        fetched.append(ids)
+        fetch_started.set()
+        fetch_release.wait(5)
+        return {r_id: ({"id": r_id}, "editor") for r_id in ids}
+
+    def fast_fetch(ids):
+        fetched.append(ids)
+        return {r_id: ({"id": r_id}, None) for r_id in ids}
+
+    thread = threading.Thread(target=loads.load, args=("block", ["a", "b"], slow_fetch))
+    thread.start()
+    fetch_started.wait(5)
+
+    result = {}
+
+    def join_load():
+        result.update(loads.load("block", ["b", "c"], fast_fetch))
+
+    joiner = threading.Thread(target=join_load)
+    joiner.start()
+    while not loads.hits:
+        time.sleep(0.01)
+    fetch_release.set()
+    thread.join(5)
+    joiner.join(5)
+
+    assert fetched == [["a", "b"], ["c"]]
+    assert result == {"b": ({"id": "b"}, "editor"), "c": ({"id": "c"}, None)}
+    assert loads.misses == 3
+    assert loads.hits == 1
+
+
+def test_record_loads_error_released():
+    loads = RecordLoads()
+
+    def failing_fetch(ids):
+        raise RuntimeError("fail")
+
+    with pytest.raises(RuntimeError):
+        loads.load("block", ["a"], failing_fetch)
+
+    assert loads.load("block", ["a"], lambda ids: {"a": (None, None)}) == {
+        "a": (None, None)
+    }
+    assert loads.misses == 2
@@ -0,0 +1,31 @@
+from csv2notion.notion_db_schema import SchemaIndex
+
+TEST_SCHEMA = {
+    "title": {"name": "Name", "type": "title"},
+    "abcd": {
+        "name": "Tags",
+        "type": "multi_select",
+        "options": [{"id": "1", "color": "default", "value": "A"}],
+    },
+}
+
+
+def test_schema_index_get_property():
+    schema_index = SchemaIndex(TEST_SCHEMA)
+
+    assert schema_index.key_column == "Name"
+    assert schema_index.get_property("abcd")["name"] == "Tags"
+    assert schema_index.get_property("Tags")["id"] == "abcd"
+    assert schema_index.get_property("title")["name"] == "Name"
+    assert schema_index.get_property("missing") is None
+
+
+def test_schema_index_add_options():
+    schema_index = SchemaIndex(TEST_SCHEMA)
+
+    new_options = schema_index.add_options("abcd", ["a", "b", "B"], lambda: "red")
+
+    assert [o["value"] for o in new_options] == ["A", "b"]
+    assert schema_index.option_values("abcd") == {"a", "b"}
+    assert schema_index.add_options("abcd", ["b"], lambda: "red") is None
+    assert len(TEST_SCHEMA["abcd"]["options"]) == 1
@@ -0,0 +1,29 @@
+import os
+
+from csv2notion.utils_file import DirectoryIndex
+
+
+def test_directory_index(tmp_path):
+    (tmp_path / "sub").mkdir()
+    (tmp_path / "sub" / "test.txt").write_text("test")
+    (tmp_path / "broken_link").symlink_to(tmp_path / "missing")
+
+    test_index = DirectoryIndex()
+
+    assert test_index.exists(tmp_path / "sub")
+    assert test_index.exists(tmp_path / "sub" / "test.txt")
+    assert not test_index.exists(tmp_path / "sub" / "missing.txt")
+    assert not test_index.exists(tmp_path / "missing" / "test.txt")
+    assert not test_index.exists(tmp_path / "broken_link")
+
+
+def test_directory_index_listed_once(tmp_path, mocker):
+    (tmp_path / "test.txt").write_text("test")
+
+    scandir = mocker.spy(os, "scandir")
+
+    test_index = DirectoryIndex()
+
+    assert test_index.exists(tmp_path / "test.txt")
+    assert test_index.exists(tmp_path / "test.txt")
+    assert scandir.call_count == 1
@@ -0,0 +1,71 @@
+import threading
+import time
+
+import pytest
+
+from csv2notion.utils_threading import run_task_graph
+
+
+def test_run_task_graph_order():
+    finished = []
+    lock = threading.Lock()
+
+    def task(name):
+        def run():
+            with lock:
+                finished.append(name)
+
+        return run
+
+    a, b, c, d = task("a"), task("b"), task("c"), task("d")
+
+    run_task_graph({a: [], b: [a], c: [a], d: [b, c]}, max_workers=3)
+
+    assert finished[0] == "a"
+    assert set(finished[1:3]) == {"b", "c"}
+    assert finished[3] == "d"
+
+
+def test_run_task_graph_first_error():
+    b_started = threading.Event()
+
+    def a():
+        b_started.wait(timeout=5)
+        raise ValueError("a")
+
+    def b():
+        b_started.set()
+        raise ValueError("b")
+
+    def c():
+        raise AssertionError("must not run")
+
+    with pytest.raises(ValueError, match="a"):
+        run_task_graph({a: [], b: [], c: [b]}, max_workers=2)
+
+
+@pytest.mark.parametrize("slow_task", ["missing", "db_dup"])
+def test_run_task_graph_error_independent_of_timing(slow_task):
+    def step(name, error=None):
+        def run():
+            if name == slow_task:
+                time.sleep(0.1)
+            if error:
+                raise ValueError(error)
+
+        return run
+
+    merge = step("merge")
+    missing = step("missing")
+    unsupported = step("unsupported", "unsupported")
+    db_dup = step("db_dup", "db duplicates")
+
+    steps = {
+        merge: [],
+        missing: [merge],
+        unsupported: [missing],
+        db_dup: [merge],
+    }
+
+    with pytest.raises(ValueError, match="unsupported"):
+        run_task_graph(steps, max_workers=2)